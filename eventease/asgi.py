@@ -2,6 +2,9 @@
 ASGI config for eventease project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with ``gunicorn eventease.asgi -k uvicorn.workers.UvicornWorker``;
+the listings and event details then run as native async views, and
+database connections are pooled, since requests do not keep to a thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +15,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eventease.settings')
+os.environ.setdefault('EVENTEASE_ASYNC_VIEWS', '1')
+os.environ.setdefault('DATABASE_CONNECTIONS', 'pool')
 
 application = get_asgi_application()
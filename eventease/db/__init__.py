@@ -0,0 +1,4 @@
+"""
+Database backends that count connections and can share them between
+threads through a per-process pool. See eventease.db.pool.
+"""
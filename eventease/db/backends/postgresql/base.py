@@ -0,0 +1,8 @@
+from django.db.backends.postgresql import base
+from eventease.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    PostgreSQL with connection counting and optional pooling.
+    """
@@ -0,0 +1,13 @@
+from django.db.backends.sqlite3 import base
+from eventease.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    SQLite with connection counting and optional pooling, for local
+    development and tests. In-memory databases are never pooled.
+    """
+    def get_pool_size(self):
+        if self.is_in_memory_db():
+            return 0
+        return super().get_pool_size()
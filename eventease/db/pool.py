@@ -0,0 +1,230 @@
+"""
+Connection counting and pooling for the backends in eventease.db.
+
+Django gives each thread its own connection and, with CONN_MAX_AGE,
+keeps it open for that thread's later requests. ASGI servers and
+run_concurrently run work on short-lived threads, though, so those
+connections are seldom used twice. When a database's settings have a
+positive POOL_SIZE, a connection closed at the end of a request is
+instead returned to a pool shared by the threads of the process, and
+the next thread to connect takes it after checking that it still works.
+
+Every process counts the connections it opened and those it reused,
+either kept open by a thread from an earlier request or taken from the
+pool. It logs the counts every LOG_EVERY connections and when it exits;
+uvicorn workers are stopped by a signal and skip the latter.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+STAT_NAMES = ('opened', 'reused', 'discarded', 'idle')
+LOG_EVERY = 1000
+
+logger = logging.getLogger('eventease.db')
+
+counters = {}
+counters_lock = threading.Lock()
+pools = {}
+pools_lock = threading.Lock()
+
+
+def count(alias, name):
+    with counters_lock:
+        counted = counters.setdefault(alias, Counter())
+        counted[name] += 1
+        connected = counted['opened'] + counted['reused']
+    if name != 'discarded' and connected % LOG_EVERY == 0:
+        log_connection_stats()
+
+
+def connection_stats():
+    """
+    Returns a dict of database alias to this process's connection
+    counts: connections opened, reused, discarded by the pool as broken,
+    too old or surplus, and idle in the pool now.
+    """
+    with counters_lock:
+        stats = {
+            alias: Counter(counted) for alias, counted in counters.items()
+        }
+    for pool in list(pools.values()):
+        if pool.pid == os.getpid():
+            stats.setdefault(pool.alias, Counter())['idle'] += len(pool)
+    return {
+        alias: {name: counted[name] for name in STAT_NAMES}
+        for alias, counted in stats.items()
+    }
+
+
+@atexit.register
+def log_connection_stats():
+    for alias, stats in connection_stats().items():
+        logger.info(
+            "Process %s, database %r: %s connections opened, %s reused, "
+            "%s discarded, %s idle.", os.getpid(), alias, stats['opened'],
+            stats['reused'], stats['discarded'], stats['idle'],
+        )
+
+
+@receiver(request_started)
+def count_kept_connections(**kwargs):
+    """
+    Counts the connections a thread kept open from an earlier request.
+    Django's own receiver, connected first, has already closed those
+    past CONN_MAX_AGE.
+    """
+    for connection in connections.all(initialized_only=True):
+        if (
+            isinstance(connection, PooledDatabaseWrapperMixin) and
+            connection.connection is not None
+        ):
+            count(connection.alias, 'reused')
+
+
+class ConnectionPool:
+    """
+    Idle connections to one database, most recently used first, with
+    the time each was opened. Connections older than max_age seconds
+    are closed rather than reused; None keeps them indefinitely.
+    """
+    def __init__(self, alias, size, max_age):
+        self.alias = alias
+        self.size = size
+        self.max_age = max_age
+        self.pid = os.getpid()
+        self.idle = deque()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.idle)
+
+    def expired(self, opened_at):
+        return (
+            self.max_age is not None and
+            time.monotonic() - opened_at >= self.max_age
+        )
+
+    def acquire(self, is_usable):
+        """
+        Returns an idle connection that passes is_usable and the time it
+        was opened, or None. Connections that fail are closed.
+        """
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                connection, opened_at = self.idle.pop()
+            if not self.expired(opened_at) and is_usable(connection):
+                return connection, opened_at
+            self.discard(connection)
+
+    def release(self, connection, opened_at):
+        """
+        Returns a connection to the pool, or closes it if it is too old
+        or the pool is full.
+        """
+        if not self.expired(opened_at):
+            with self.lock:
+                if len(self.idle) < self.size:
+                    self.idle.append((connection, opened_at))
+                    return
+        self.discard(connection)
+
+    def discard(self, connection):
+        count(self.alias, 'discarded')
+        try:
+            connection.close()
+        except Exception:
+            # It is being dropped for being broken in the first place.
+            pass
+
+    def clear(self):
+        """
+        Closes every idle connection.
+        """
+        with self.lock:
+            idle, self.idle = self.idle, deque()
+        for connection, opened_at in idle:
+            connection.close()
+
+
+def get_pool(alias, settings_dict, size):
+    """
+    Returns the process's pool for the database described by the
+    settings. Pools are not shared with forked processes.
+    """
+    key = (
+        os.getpid(), alias, settings_dict['NAME'], settings_dict['HOST'],
+        settings_dict['PORT'], settings_dict['USER'],
+    )
+    with pools_lock:
+        if key not in pools:
+            pools[key] = ConnectionPool(
+                alias, size, settings_dict.get('POOL_MAX_AGE')
+            )
+        return pools[key]
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Counts the connections a database wrapper opens and pools them
+    when the database's POOL_SIZE setting is positive.
+    """
+    opened_at = None
+
+    def get_pool_size(self):
+        return self.settings_dict.get('POOL_SIZE', 0)
+
+    @property
+    def pool(self):
+        size = self.get_pool_size()
+        if not size:
+            return None
+        return get_pool(self.alias, self.settings_dict, size)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is not None:
+            pooled = pool.acquire(self.is_usable_connection)
+            if pooled is not None:
+                count(self.alias, 'reused')
+                connection, self.opened_at = pooled
+                return connection
+        connection = super().get_new_connection(conn_params)
+        self.opened_at = time.monotonic()
+        count(self.alias, 'opened')
+        return connection
+
+    def is_usable_connection(self, connection):
+        """
+        Checks a pooled connection the way CONN_HEALTH_CHECKS checks a
+        kept one, with a trivial query.
+        """
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except self.Database.Error:
+            return False
+        return True
+
+    def _close(self):
+        pool = self.pool
+        # Connections closed inside a transaction, or left with a
+        # different autocommit setting, are not handed on.
+        if (
+            pool is None or self.connection is None or
+            self.in_atomic_block or
+            self.autocommit != self.settings_dict['AUTOCOMMIT']
+        ):
+            return super()._close()
+        pool.release(self.connection, self.opened_at)
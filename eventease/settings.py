@@ -1,6 +1,7 @@
 from pathlib import Path
 import os
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 if os.path.isfile('env.py'):
     import env  # noqa
 import sys
@@ -10,6 +11,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 SECRET_KEY = os.environ.get("SECRET_KEY")
 
@@ -68,6 +71,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'events.replicas.ReplicaPinMiddleware',
 ]
 
 ROOT_URLCONF = 'eventease.urls'
@@ -90,13 +94,144 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'eventease.wsgi.application'
 
+# eventease.asgi turns this on, so the listings and event details are
+# served by native async views when the site runs under ASGI.
+ASYNC_VIEWS = os.environ.get('EVENTEASE_ASYNC_VIEWS') == '1'
+
 
 DATABASES = {
     'default': dj_database_url.parse(os.environ.get("DATABASE_URL"))
 }
 
+# With REPLICA_DATABASE_URL set, the listings and anonymous event
+# details pages read from that replica. Visitors who have just written
+# read from the primary for REPLICA_PIN_SECONDS, which should exceed
+# the replica's usual lag.
+REPLICA_DATABASE = None
+if os.environ.get('REPLICA_DATABASE_URL'):
+    REPLICA_DATABASE = 'replica'
+    DATABASES['replica'] = dj_database_url.parse(
+        os.environ.get('REPLICA_DATABASE_URL')
+    )
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+DATABASE_ROUTERS = ['events.replicas.ReplicaRouter']
+
 if 'test' in sys.argv:
     DATABASES['default']['ENGINE'] = 'django.db.backends.sqlite3'
+    # A file-backed test database lets threaded tests wait on SQLite's
+    # write lock instead of failing the way a shared-cache in-memory
+    # database does.
+    DATABASES['default']['TEST'] = {
+        'NAME': os.path.join(BASE_DIR, 'test_db.sqlite3'),
+    }
+    DATABASES['default']['OPTIONS'] = {'timeout': 30}
+    # A second SQLite database stands in for the replica. Tests that
+    # read from it list it in their databases and set REPLICA_DATABASE.
+    REPLICA_DATABASE = None
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'replica.sqlite3'),
+        'TEST': {'NAME': os.path.join(BASE_DIR, 'test_replica.sqlite3')},
+        'OPTIONS': {'timeout': 30},
+    }
+
+# How database connections are reused. 'close' opens one per request.
+# 'persistent' keeps each thread's connection open for
+# DATABASE_CONN_MAX_AGE seconds, checking that it still works before a
+# request uses it again. 'pool' hands connections closed at the end of
+# a request to a pool of up to DATABASE_POOL_SIZE idle connections
+# shared by the threads of a process, which suits ASGI and threaded
+# workers, whose requests do not keep to one thread.
+# The eventease.db backends count the connections each process opens
+# and reuses, and log the counts on exit at the EVENTEASE_DB_LOG_LEVEL
+# level (INFO shows them).
+DATABASE_CONNECTIONS = os.environ.get('DATABASE_CONNECTIONS', 'persistent')
+if DATABASE_CONNECTIONS not in ('close', 'persistent', 'pool'):
+    raise ImproperlyConfigured(
+        "DATABASE_CONNECTIONS must be 'close', 'persistent' or 'pool'."
+    )
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', 600))
+COUNTED_ENGINES = {
+    'django.db.backends.postgresql': 'eventease.db.backends.postgresql',
+    'django.db.backends.postgresql_psycopg2': (
+        'eventease.db.backends.postgresql'
+    ),
+    'django.db.backends.sqlite3': 'eventease.db.backends.sqlite3',
+}
+for database in DATABASES.values():
+    database['ENGINE'] = COUNTED_ENGINES.get(
+        database['ENGINE'], database['ENGINE']
+    )
+    database['CONN_HEALTH_CHECKS'] = True
+    database['CONN_MAX_AGE'] = (
+        DATABASE_CONN_MAX_AGE if DATABASE_CONNECTIONS == 'persistent' else 0
+    )
+    if DATABASE_CONNECTIONS == 'pool':
+        database['POOL_SIZE'] = int(
+            os.environ.get('DATABASE_POOL_SIZE', 10)
+        )
+        database['POOL_MAX_AGE'] = DATABASE_CONN_MAX_AGE
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'eventease.db': {
+            'handlers': ['console'],
+            'level': os.environ.get('EVENTEASE_DB_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+# Cache invalidation has to reach every worker process, so deployments
+# running more than one should point REDIS_URL at a shared cache.
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL'),
+    }
+
+# Outgoing mail is sent by the run_worker process. Without EMAIL_BACKEND
+# nothing is sent and the mail jobs are not queued at all.
+EMAIL_BACKEND = os.environ.get(
+    'EMAIL_BACKEND', 'django.core.mail.backends.dummy.EmailBackend'
+)
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS') == '1'
+DEFAULT_FROM_EMAIL = os.environ.get(
+    'DEFAULT_FROM_EMAIL', 'webmaster@localhost'
+)
+SERVER_EMAIL = DEFAULT_FROM_EMAIL
+# Comma-separated addresses that receive the contact form messages.
+MANAGERS = [
+    ('', address.strip())
+    for address in os.environ.get('MANAGERS', '').split(',')
+    if address.strip()
+]
+
+
+# Event image uploads are written to a temporary file as they arrive;
+# bytes past MAX_UPLOAD_SIZE are discarded, and the form rejects the
+# file by its size.
+MAX_UPLOAD_SIZE = 3 * 1024 * 1024
+
+# Where run_worker stores event images once it has resized them.
+EVENT_IMAGE_STORAGE = os.environ.get(
+    'EVENT_IMAGE_STORAGE', 'events.images.CloudinaryImageStorage'
+)
 
 
 # Password validation
@@ -1,6 +1,22 @@
 from django.contrib import admin
-from .models import Event, EventRegistration, ContactMessage
+from .models import Event, EventRegistration, ContactMessage, Job
+from .models import ArchivedEvent, ArchivedRegistration
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """
+    Shows archived rows without letting them be added or changed.
+    """
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 admin.site.register(Event)
 admin.site.register(EventRegistration)
 admin.site.register(ContactMessage)
+admin.site.register(Job)
+admin.site.register(ArchivedEvent, ReadOnlyAdmin)
+admin.site.register(ArchivedRegistration, ReadOnlyAdmin)
@@ -0,0 +1,263 @@
+"""
+Read-only JSON API for published events and their rosters.
+
+The views fetch rows with values() and serialize the dicts directly,
+skipping model instances, forms and templates. Lists and rosters are
+cursor-paginated and every response carries an ETag, so clients can
+revalidate with If-None-Match and get an empty 304 back.
+"""
+from datetime import date
+from django.http import JsonResponse
+from django.utils.functional import cached_property
+from django.views import View
+from .cache import ConditionalGetMixin, USER_VERSION_PREFIX
+from .cache import get_listings_generation, get_versions, make_etag
+from .forms import EventFilterForm
+from .images import DEFAULT_WIDTH
+from .models import ArchivedEvent, Event, EventRegistration
+from .pagination import CursorPaginator, TieredCursorPaginator
+
+EVENT_FIELDS = (
+    'id', 'slug', 'title', 'description', 'date', 'time', 'location',
+    'capacity', 'registration_count', 'is_placeholder', 'image_variants',
+    'created_by__username', 'created_by__first_name',
+    'created_by__last_name',
+)
+REGISTRATION_FIELDS = (
+    'id', 'note', 'registered_at',
+    'user__username', 'user__first_name', 'user__last_name',
+)
+
+
+def display_name(username, first_name, last_name):
+    """
+    Returns the name the templates show for a user: the full name,
+    or the username if it is blank.
+    """
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def serialize_event(row):
+    """
+    Converts an Event values() row with EVENT_FIELDS into a JSON object.
+    """
+    return {
+        'id': row['id'],
+        'slug': row['slug'],
+        'title': row['title'],
+        'description': row['description'],
+        'date': row['date'],
+        'time': row['time'],
+        'location': row['location'],
+        'capacity': row['capacity'],
+        'registration_count': row['registration_count'],
+        'image': (
+            None if row['is_placeholder']
+            else row['image_variants'].get(str(DEFAULT_WIDTH))
+        ),
+        'image_variants': row['image_variants'],
+        'created_by': {
+            'username': row['created_by__username'],
+            'name': display_name(
+                row['created_by__username'],
+                row['created_by__first_name'],
+                row['created_by__last_name'],
+            ),
+        },
+    }
+
+
+def serialize_registration(row):
+    """
+    Converts an EventRegistration values() row with REGISTRATION_FIELDS
+    into a JSON object.
+    """
+    return {
+        'id': row['id'],
+        'username': row['user__username'],
+        'name': display_name(
+            row['user__username'],
+            row['user__first_name'],
+            row['user__last_name'],
+        ),
+        'note': row['note'],
+        'registered_at': row['registered_at'],
+    }
+
+
+def error_response(message, status, **extra):
+    return JsonResponse({'detail': message, **extra}, status=status)
+
+
+class ApiView(ConditionalGetMixin, View):
+    """
+    Base class for the read-only API views.
+    """
+    http_method_names = ['get', 'head', 'options']
+
+
+class CursorPageMixin:
+    """
+    Paginates values() rows by cursor and renders a page as
+    {"results": [...], "next": url, "previous": url}.
+    """
+    page_size = 20
+    cursor_ordering = ('id',)
+    cursor_query_param = 'cursor'
+
+    def get_cursor_paginator(self, queryset):
+        return CursorPaginator(queryset, self.page_size, self.cursor_ordering)
+
+    def page_response(self, queryset, serialize):
+        paginator = self.get_cursor_paginator(queryset)
+        cursor = self.request.GET.get(self.cursor_query_param) or None
+        try:
+            page = paginator.page(cursor)
+        except ValueError:
+            return error_response("Invalid page cursor.", 400)
+        return JsonResponse({
+            'results': [serialize(row) for row in page],
+            'next': self.page_url(page.next_cursor),
+            'previous': self.page_url(page.previous_cursor),
+        })
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params[self.cursor_query_param] = cursor
+        return f'{self.request.path}?{params.urlencode()}'
+
+
+class ApiEventList(CursorPageMixin, ApiView):
+    """
+    Base class for the event listings. Accepts the same filters as the
+    HTML listings and is validated against the listings generation,
+    so a matching request costs a cache lookup and no queries.
+    """
+    def get_etag(self, request, *args, **kwargs):
+        return make_etag(
+            'api', get_listings_generation(), date.today().isoformat(),
+            request.get_full_path(),
+        )
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def filter_events(self, queryset):
+        """
+        Applies the listing filters and selects the serialized fields.
+        """
+        return self.filter_form.filter(queryset).values(*EVENT_FIELDS)
+
+    def get(self, request, *args, **kwargs):
+        params = request.GET.copy()
+        params.pop(self.cursor_query_param, None)
+        self.filter_form = EventFilterForm(params or None)
+        if self.filter_form.is_bound and not self.filter_form.is_valid():
+            # Ignoring the filter would pass unfiltered results off as
+            # filtered ones.
+            return error_response("Invalid filters.", 400, errors={
+                field: list(errors)
+                for field, errors in self.filter_form.errors.items()
+            })
+        return self.page_response(
+            self.filter_events(self.get_queryset()), serialize_event
+        )
+
+
+class ApiUpcomingEventList(ApiEventList):
+    """
+    Lists upcoming published events, soonest first.
+    """
+    cursor_ordering = ('date', 'time', 'id')
+
+    def get_queryset(self):
+        return Event.objects.filter(status=1, date__gte=date.today())
+
+
+class ApiPastEventList(ApiEventList):
+    """
+    Lists past published events, most recent first, including archived
+    ones.
+    """
+    cursor_ordering = ('-date', '-time', '-id')
+
+    def get_queryset(self):
+        return Event.objects.filter(status=1, date__lt=date.today())
+
+    def get_cursor_paginator(self, queryset):
+        archived = self.filter_events(ArchivedEvent.objects.filter(status=1))
+        return TieredCursorPaginator(
+            [queryset, archived], self.page_size, self.cursor_ordering
+        )
+
+
+class ApiEventMixin:
+    """
+    Looks up the published event named in the URL once per request,
+    for both the ETag and the response.
+    """
+    event_fields = ('id', 'updated_at', 'roster_version', 'created_by_id')
+
+    @cached_property
+    def event(self):
+        return (
+            Event.objects
+            .filter(status=1, slug=self.kwargs['slug'])
+            .values(*self.event_fields)
+            .first()
+        )
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return self.event['updated_at'] if self.event else None
+
+
+class ApiEventDetails(ApiEventMixin, ApiView):
+    """
+    Returns a single published event.
+    """
+    event_fields = ApiEventMixin.event_fields + EVENT_FIELDS
+
+    def get_etag(self, request, *args, **kwargs):
+        if self.event is None:
+            return None
+        creator_id = self.event['created_by_id']
+        creator_version = get_versions(
+            USER_VERSION_PREFIX, [creator_id]
+        )[creator_id]
+        return make_etag(
+            'api', self.event['id'], self.event['updated_at'].isoformat(),
+            self.event['roster_version'], creator_version,
+        )
+
+    def get(self, request, *args, **kwargs):
+        if self.event is None:
+            return error_response("Event not found.", 404)
+        return JsonResponse(serialize_event(self.event))
+
+
+class ApiEventRegistrations(ApiEventMixin, CursorPageMixin, ApiView):
+    """
+    Returns the roster of a published event, newest registrations first.
+    """
+    page_size = 50
+    cursor_ordering = ('-registered_at', '-id')
+
+    def get_etag(self, request, *args, **kwargs):
+        if self.event is None:
+            return None
+        return make_etag(
+            'api', self.event['id'], self.event['roster_version'],
+            request.get_full_path(),
+        )
+
+    def get(self, request, *args, **kwargs):
+        if self.event is None:
+            return error_response("Event not found.", 404)
+        return self.page_response(
+            EventRegistration.objects
+            .filter(event_id=self.event['id'])
+            .values(*REGISTRATION_FIELDS),
+            serialize_registration,
+        )
@@ -0,0 +1,93 @@
+"""
+Native async versions of the listing and event details views, used
+instead of the sync ones when the site runs under ASGI (see
+settings.ASYNC_VIEWS). They share their querysets, templates, caching
+and validators with the sync views; only the data loading differs.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from . import views
+
+
+async def load_user(request):
+    """
+    Resolves request.user in a sync thread, since the lazy user queries
+    the session and user tables the first time it is used.
+    """
+    await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+class AsyncViewMixin:
+    """
+    Loads the user before dispatching, so the caching and validator
+    mixins can check it without touching the database.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        await load_user(request)
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncListMixin(AsyncViewMixin):
+    """
+    Fetches the page of events with the async ORM before building the
+    same context as the sync listing.
+    """
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        paginator = self.get_cursor_paginator(
+            self.object_list, self.paginate_by
+        )
+        cursor = request.GET.get(self.cursor_query_param) or None
+        try:
+            querysets, backwards = paginator.page_querysets(cursor)
+        except ValueError:
+            raise Http404("Invalid page cursor.")
+        row_lists = []
+        for queryset in querysets:
+            row_lists.append([event async for event in queryset])
+        rows = paginator.merge_rows(row_lists, backwards)
+        self.page = paginator.build_page(rows, cursor, backwards)
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        page = self.page
+        return (page.paginator, page, page.object_list,
+                page.has_other_pages())
+
+
+class UpcomingEventList(AsyncListMixin, views.UpcomingEventList):
+    """
+    Async version of views.UpcomingEventList.
+    """
+
+
+class PastEventList(AsyncListMixin, views.PastEventList):
+    """
+    Async version of views.PastEventList.
+    """
+
+
+class EventDetails(AsyncViewMixin, views.EventDetails):
+    """
+    Async version of views.EventDetails. GET loads the event and its
+    roster concurrently; the user's registration is picked out of the
+    roster, so it needs no query of its own. Registration actions keep
+    running in the sync view, in a thread, since they use transactions.
+    """
+    async def aget_etag(self, request, *args, **kwargs):
+        # A revalidating client may not need the roster at all, so only
+        # the event is loaded before the validators are compared.
+        revalidating = (
+            'HTTP_IF_NONE_MATCH' in request.META or
+            'HTTP_IF_MODIFIED_SINCE' in request.META
+        )
+        await self.loader.aload(registrations=not revalidating)
+        return self.get_etag(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        await self.loader.aload()
+        self.object = self.loader.event
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super().post)(request, *args, **kwargs)
@@ -0,0 +1,173 @@
+"""
+Helpers for the benchmark management commands, which time views
+in-process with Django's test client or load a running server.
+"""
+import asyncio
+import math
+import time
+import tracemalloc
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+def benchmark_client(**defaults):
+    """
+    Returns a test client whose requests pass the ALLOWED_HOSTS check,
+    using the first allowed host that is not a pattern.
+    """
+    host = next(
+        (
+            name for name in settings.ALLOWED_HOSTS
+            if name != '*' and not name.startswith('.')
+        ),
+        'localhost',
+    )
+    return Client(HTTP_HOST=host, **defaults)
+
+
+# Caches private to this process, which are safe to empty.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def cold_cache():
+    """
+    Returns a function that empties the default cache, for measuring
+    views that do their full work on every request. Raises ValueError
+    if the cache is shared with other processes, such as Redis, since
+    emptying it would empty it for the whole site.
+    """
+    backend = settings.CACHES[DEFAULT_CACHE_ALIAS]['BACKEND']
+    if backend not in LOCAL_CACHE_BACKENDS:
+        raise ValueError(
+            f"Refusing to clear the shared {backend} cache; run the "
+            f"benchmark without REDIS_URL."
+        )
+    return cache.clear
+
+
+def percentile(values, fraction):
+    """
+    Returns the value below which the given fraction of values fall,
+    using the nearest-rank method.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure(client, url, requests, before_each=None):
+    """
+    Requests the URL the given number of times and returns the latency
+    percentiles in milliseconds, the queries per request and the size
+    of the last response. Raises ValueError on a non-200 response.
+    """
+    timings = []
+    queries = 0
+    size = 0
+    for _ in range(requests):
+        if before_each is not None:
+            before_each()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            content = b''.join(response) if response.streaming else (
+                response.content
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise ValueError(f"{url} answered {response.status_code}.")
+        queries = max(queries, len(captured))
+        size = len(content)
+    return {
+        'url': url,
+        'requests': requests,
+        'mean_ms': sum(timings) / len(timings),
+        'p50_ms': percentile(timings, 0.50),
+        'p95_ms': percentile(timings, 0.95),
+        'p99_ms': percentile(timings, 0.99),
+        'queries': queries,
+        'bytes': size,
+    }
+
+
+def measure_memory(client, url, before_each=None):
+    """
+    Requests the URL once while tracing allocations and returns the
+    peak memory allocated by the request, in bytes. Tracing slows code
+    down, so this is kept apart from the timed requests.
+    """
+    if before_each is not None:
+        before_each()
+    tracemalloc.start()
+    try:
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if response.status_code != 200:
+        raise ValueError(f"{url} answered {response.status_code}.")
+    return peak
+
+
+async def fetch(host, port, path):
+    """
+    Sends one GET request over a new connection and returns its status.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {host}\r\n'
+            'Connection: close\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        while await reader.read(65536):
+            pass
+    finally:
+        writer.close()
+    return int(status_line.split()[1])
+
+
+async def run_load(host, port, path, concurrency, duration):
+    """
+    Keeps the given number of requests to the path in flight for the
+    given number of seconds and returns the throughput in requests per
+    second, the latency percentiles in milliseconds and the number of
+    failed requests.
+    """
+    timings = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await fetch(host, port, path)
+            except (OSError, ValueError, IndexError):
+                status = None
+            if status == 200:
+                timings.append((time.perf_counter() - started) * 1000)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        'path': path,
+        'requests': len(timings),
+        'errors': errors,
+        'requests_per_second': len(timings) / elapsed,
+        'p50_ms': percentile(timings, 0.50) if timings else None,
+        'p99_ms': percentile(timings, 0.99) if timings else None,
+    }
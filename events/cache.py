@@ -0,0 +1,249 @@
+import hashlib
+import time
+from datetime import date, datetime, timezone
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+EVENT_VERSION_PREFIX = 'event-version'
+USER_VERSION_PREFIX = 'user-version'
+LISTINGS_GENERATION_KEY = 'listings-generation'
+
+
+def new_version():
+    """
+    Returns a fresh version stamp. Stamps are unique rather than counted,
+    so a stamp lost to cache eviction is never handed out again and
+    cannot revive fragments cached under it.
+    """
+    return time.time_ns()
+
+
+def get_versions(prefix, ids):
+    """
+    Returns a dict of id to version stamp for the given ids in one cache
+    round trip, creating stamps for ids that do not have one yet.
+    """
+    keys = {f'{prefix}:{pk}': pk for pk in ids}
+    found = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def bump_version(prefix, pk):
+    """
+    Gives the object a new version stamp, invalidating every fragment
+    cached under the old one.
+    """
+    cache.set(f'{prefix}:{pk}', new_version(), None)
+
+
+def attach_card_versions(events):
+    """
+    Sets card_version on each event to a stamp combining the event's
+    and its creator's versions, for use as an event card cache key.
+    """
+    events = list(events)
+    event_versions = get_versions(
+        EVENT_VERSION_PREFIX, [event.pk for event in events]
+    )
+    user_versions = get_versions(
+        USER_VERSION_PREFIX, {event.created_by_id for event in events}
+    )
+    for event in events:
+        event.card_version = (
+            f'{event_versions[event.pk]}.{user_versions[event.created_by_id]}'
+        )
+
+
+def get_listings_generation():
+    """
+    Returns the stamp that changes whenever any published event does.
+    """
+    generation = cache.get(LISTINGS_GENERATION_KEY)
+    if generation is None:
+        cache.add(LISTINGS_GENERATION_KEY, new_version(), None)
+        generation = cache.get(LISTINGS_GENERATION_KEY)
+    return generation
+
+
+def bump_listings_generation():
+    """
+    Invalidates every cached page that lists events.
+    """
+    cache.set(LISTINGS_GENERATION_KEY, new_version(), None)
+
+
+def make_etag(*parts):
+    """
+    Returns a quoted ETag derived from the given parts.
+    """
+    joined = ':'.join(str(part) for part in parts)
+    return '"%s"' % hashlib.md5(joined.encode()).hexdigest()
+
+
+def viewer_stamp(request):
+    """
+    Identifies what of a page depends on who is looking at it: nothing
+    for anonymous visitors; the user and their CSRF secret, which forms
+    on the page are tied to, for logged-in users.
+    """
+    if not request.user.is_authenticated:
+        return 'anonymous'
+    return f"{request.user.pk}:{request.META.get('CSRF_COOKIE', '')}"
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified headers to GET and HEAD responses and
+    answers 304 Not Modified when the client's copy is current, before
+    the page is rendered or looked up in the page cache.
+    Views override get_etag and get_last_modified, which receive the
+    same arguments as the view. Async views can override aget_etag and
+    aget_last_modified instead, to load what the validators need
+    without blocking; by default they call the sync methods.
+    """
+    def get_etag(self, request, *args, **kwargs):
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return None
+
+    async def aget_etag(self, request, *args, **kwargs):
+        return self.get_etag(request, *args, **kwargs)
+
+    async def aget_last_modified(self, request, *args, **kwargs):
+        return self.get_last_modified(request, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.dispatch_conditionally(request, *args, **kwargs)
+        conditional = condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified,
+        )
+        return conditional(super().dispatch)(request, *args, **kwargs)
+
+    async def dispatch_conditionally(self, request, *args, **kwargs):
+        """
+        Does for async views what the condition decorator does for
+        sync ones.
+        """
+        etag = await self.aget_etag(request, *args, **kwargs)
+        etag = quote_etag(etag) if etag is not None else None
+        last_modified = await self.aget_last_modified(
+            request, *args, **kwargs
+        )
+        last_modified = (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = await super().dispatch(request, *args, **kwargs)
+        if last_modified and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+        return response
+
+
+class ListingsConditionalGetMixin(ConditionalGetMixin):
+    """
+    Validates listing pages against the listings generation stamp,
+    which costs a cache lookup and no queries.
+    """
+    def get_etag(self, request, *args, **kwargs):
+        return make_etag(
+            get_listings_generation(), date.today().isoformat(),
+            request.get_full_path(), viewer_stamp(request),
+        )
+
+    def get_last_modified(self, request, *args, **kwargs):
+        # Logged-in pages change on login without any event changing,
+        # so they are only validated by ETag.
+        if request.user.is_authenticated:
+            return None
+        changed = datetime.fromtimestamp(
+            get_listings_generation() / 1e9, tz=timezone.utc
+        )
+        # Events move from upcoming to past at midnight.
+        midnight = datetime.combine(
+            date.today(), datetime.min.time()
+        ).astimezone(timezone.utc)
+        return max(changed, midnight)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Caches the whole rendered page for logged-out visitors.
+
+    The key combines the path and query string with today's date, so
+    entries roll over at midnight, and with the listings generation, so
+    they are dropped when a published event changes. Logged-in users
+    always get a freshly rendered page, and responses that set cookies
+    (such as a new CSRF cookie) are never stored.
+    """
+    page_cache_timeout = 60 * 60
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD') or
+            request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.dispatch_cached(request, *args, **kwargs)
+
+        key = self.get_page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        self.cache_response(request, key, response)
+        return response
+
+    async def dispatch_cached(self, request, *args, **kwargs):
+        """
+        Does the same for async views, whose request.user must already
+        have been loaded.
+        """
+        key = self.get_page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = await super().dispatch(request, *args, **kwargs)
+        self.cache_response(request, key, response)
+        return response
+
+    def cache_response(self, request, key, response):
+        """
+        Stores a successful response once it has been rendered.
+        """
+        if response.status_code != 200 or response.streaming:
+            return
+
+        def store(rendered):
+            # A page that used a CSRF token needs a per-visitor cookie.
+            uses_csrf = request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            if not rendered.cookies and not uses_csrf:
+                cache.set(key, rendered, self.page_cache_timeout)
+
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+
+    def get_page_cache_key(self, request):
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return (
+            f'anonymous-page:{get_listings_generation()}:'
+            f'{date.today().isoformat()}:{path}'
+        )
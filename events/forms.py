@@ -1,9 +1,11 @@
 from django import forms
 from django.forms import ClearableFileInput
 from allauth.account.forms import LoginForm, SignupForm
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from datetime import datetime, timedelta
 from .models import Event, EventRegistration, ContactMessage
+from .models import normalize_location
 
 
 class EventCreateForm(forms.ModelForm):
@@ -15,7 +17,7 @@ class EventCreateForm(forms.ModelForm):
         model = Event
         fields = [
             'title', 'description', 'date', 'time',
-            'location', 'featured_image'
+            'location', 'capacity', 'featured_image'
         ]
         widgets = {
             'title': forms.TextInput(attrs={'class': 'form-control'}),
@@ -29,6 +31,9 @@ class EventCreateForm(forms.ModelForm):
                 'type': 'time', 'class': 'form-control'
             }),
             'location': forms.TextInput(attrs={'class': 'form-control'}),
+            'capacity': forms.NumberInput(attrs={
+                'class': 'form-control', 'min': 1
+            }),
             'featured_image': ClearableFileInput(attrs={
                 'class': 'form-control',
                 'accept': 'image/*',
@@ -43,13 +48,15 @@ class EventCreateForm(forms.ModelForm):
 
     def clean_featured_image(self):
         image = self.cleaned_data.get('featured_image')
-        max_size_mb = 3
+        max_size_mb = settings.MAX_UPLOAD_SIZE // (1024 * 1024)
 
+        # Uploads past the limit were cut off while spooling to disk,
+        # but still report their full size.
         if (
             image and
             hasattr(image, 'size') and
             image.size and
-            image.size > max_size_mb * 1024 * 1024
+            image.size > settings.MAX_UPLOAD_SIZE
         ):
             raise ValidationError(
                 f"The image file is too large (>{max_size_mb}MB)."
@@ -57,6 +64,56 @@ class EventCreateForm(forms.ModelForm):
         return image
 
 
+class EventFilterForm(forms.Form):
+    """
+    Optional filters for the event listings: a date range,
+    a location and the creator's username.
+    """
+    date_from = forms.DateField(
+        required=False, label='From',
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
+    date_to = forms.DateField(
+        required=False, label='To',
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
+    location = forms.CharField(
+        required=False, max_length=255,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control', 'placeholder': 'Location'
+        })
+    )
+    creator = forms.CharField(
+        required=False, max_length=150,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control', 'placeholder': 'Organizer username'
+        })
+    )
+
+    def filter(self, queryset):
+        """
+        Narrows an event queryset by the filters that are filled in and
+        valid. Locations are matched on the normalized column, so the
+        filter can use its index instead of a case-insensitive scan.
+        """
+        if not self.is_bound:
+            return queryset
+        # Validating fills cleaned_data with whichever filters are valid.
+        self.is_valid()
+        data = self.cleaned_data
+        if data.get('date_from'):
+            queryset = queryset.filter(date__gte=data['date_from'])
+        if data.get('date_to'):
+            queryset = queryset.filter(date__lte=data['date_to'])
+        if data.get('location'):
+            queryset = queryset.filter(
+                location_normalized=normalize_location(data['location'])
+            )
+        if data.get('creator'):
+            queryset = queryset.filter(created_by__username=data['creator'])
+        return queryset
+
+
 class EventRegistrationForm(forms.ModelForm):
     """
     Form for registering to an event with an optional note input.
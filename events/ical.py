@@ -0,0 +1,212 @@
+"""
+iCalendar feeds of published events for calendar apps to subscribe to.
+
+Feeds are streamed one VEVENT at a time while the body is collected,
+and the finished body is cached under a key built from the listings
+generation, which changes whenever a published event or its attendance
+does. Calendar apps poll feeds often, so repeated polls are answered
+from the cache, or with a 304 when they send the ETag back, without
+touching the database.
+"""
+from datetime import date, datetime, timedelta, timezone
+from django.core import signing
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.timezone import get_default_timezone
+from django.views import View
+from .cache import ConditionalGetMixin, get_listings_generation, make_etag
+from .models import Event
+
+CONTENT_TYPE = 'text/calendar; charset=utf-8'
+EVENT_DURATION = timedelta(hours=1)
+FEED_TOKEN_SALT = 'events.ical.registrations'
+LINE_LIMIT = 75
+EVENT_FIELDS = (
+    'id', 'slug', 'title', 'description', 'date', 'time', 'location',
+    'updated_at',
+)
+
+
+def escape_text(value):
+    """
+    Escapes a TEXT property value as RFC 5545 requires.
+    """
+    return (
+        value.replace('\\', '\\\\').replace(';', '\\;')
+        .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """
+    Splits a content line into lines of at most 75 octets, continuing
+    each with a leading space, without splitting a UTF-8 character.
+    """
+    parts = []
+    current = ''
+    size = 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > LINE_LIMIT:
+            parts.append(current)
+            current = ' '
+            size = 1
+        current += char
+        size += width
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def format_utc(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_event(row, request):
+    """
+    Returns the VEVENT of an event values() row with EVENT_FIELDS.
+    Event dates and times are local to the site's time zone.
+    """
+    start = datetime.combine(row['date'], row['time']).replace(
+        tzinfo=get_default_timezone()
+    )
+    url = request.build_absolute_uri(
+        reverse('event_details', args=[row['slug']])
+    )
+    lines = (
+        'BEGIN:VEVENT',
+        f"UID:event-{row['id']}@{request.get_host()}",
+        f"DTSTAMP:{format_utc(row['updated_at'])}",
+        f"DTSTART:{format_utc(start)}",
+        f"DTEND:{format_utc(start + EVENT_DURATION)}",
+        f"SUMMARY:{escape_text(row['title'])}",
+        f"LOCATION:{escape_text(row['location'])}",
+        f"DESCRIPTION:{escape_text(row['description'])}",
+        f"URL:{url}",
+        'END:VEVENT',
+    )
+    return ''.join(fold_line(line) for line in lines)
+
+
+def render_calendar(name, rows, request):
+    """
+    Yields a VCALENDAR in chunks: its header, one VEVENT per row and
+    its footer.
+    """
+    yield ''.join(fold_line(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//EventEase//Events//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+    ))
+    for row in rows:
+        yield render_event(row, request)
+    yield fold_line('END:VCALENDAR')
+
+
+def feed_token(user):
+    """
+    Returns the token that identifies a user's registrations feed.
+    Calendar apps cannot log in, so the feed URL carries it instead.
+    """
+    return signing.dumps(user.pk, salt=FEED_TOKEN_SALT)
+
+
+class CalendarFeedView(ConditionalGetMixin, View):
+    """
+    Base class for the feeds. Subclasses provide the cache key, which
+    also serves as the ETag, the calendar name and the event rows.
+    """
+    http_method_names = ['get', 'head', 'options']
+    feed_cache_timeout = 60 * 60 * 24
+
+    def get_cache_key(self):
+        raise NotImplementedError
+
+    def get_calendar_name(self):
+        raise NotImplementedError
+
+    def get_rows(self):
+        raise NotImplementedError
+
+    def get_etag(self, request, *args, **kwargs):
+        return make_etag(self.get_cache_key())
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_cache_key()
+        body = cache.get(key)
+        if body is not None:
+            return HttpResponse(body, content_type=CONTENT_TYPE)
+        return StreamingHttpResponse(
+            self.stream(key), content_type=CONTENT_TYPE
+        )
+
+    def stream(self, key):
+        """
+        Yields the feed and caches it once it has been sent in full.
+        """
+        chunks = []
+        rows = self.get_rows().values(*EVENT_FIELDS).iterator(
+            chunk_size=500
+        )
+        for chunk in render_calendar(
+            self.get_calendar_name(), rows, self.request
+        ):
+            chunks.append(chunk)
+            yield chunk
+        cache.set(key, ''.join(chunks), self.feed_cache_timeout)
+
+
+class UpcomingEventsFeed(CalendarFeedView):
+    """
+    Feed of all upcoming published events.
+    """
+    def get_cache_key(self):
+        return (
+            f'ics-feed:upcoming:{get_listings_generation()}:'
+            f'{date.today().isoformat()}:{self.request.get_host()}'
+        )
+
+    def get_calendar_name(self):
+        return 'EventEase upcoming events'
+
+    def get_rows(self):
+        return (
+            Event.objects
+            .filter(status=1, date__gte=date.today())
+            .order_by('date', 'time', 'id')
+        )
+
+
+class RegistrationsFeed(CalendarFeedView):
+    """
+    Feed of the published events a user is registered for, identified
+    by the feed token in the URL. Registering or cancelling bumps the
+    listings generation, so the key changes with the user's roster.
+    """
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        try:
+            self.user_id = signing.loads(
+                kwargs['token'], salt=FEED_TOKEN_SALT
+            )
+        except signing.BadSignature:
+            raise Http404("Unknown calendar feed.")
+
+    def get_cache_key(self):
+        return (
+            f'ics-feed:registrations:{self.user_id}:'
+            f'{get_listings_generation()}:{self.request.get_host()}'
+        )
+
+    def get_calendar_name(self):
+        return 'My EventEase events'
+
+    def get_rows(self):
+        return (
+            Event.objects
+            .filter(status=1, registrations__user_id=self.user_id)
+            .order_by('date', 'time', 'id')
+        )
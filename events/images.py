@@ -0,0 +1,139 @@
+"""
+Event image processing and responsive variants.
+
+Uploaded images are staged in the database by the request, where the
+worker can read them whatever machine it runs on, and processed by a
+background job: Pillow fixes their orientation, scales them down and
+re-encodes them before they are stored for good. Until then the event
+shows the placeholder.
+
+Each event stores the URLs of its image scaled to a few widths, built
+when the event is saved, so listing pages can offer a srcset without
+building URLs while rendering and browsers download the smallest
+variant that fits the card instead of the original upload.
+"""
+import os
+import uuid
+from io import BytesIO
+from cloudinary import CloudinaryResource, uploader
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+from PIL import Image, ImageOps
+
+THUMBNAIL_WIDTHS = (320, 640, 960)
+# The variant used as src by browsers without srcset support.
+DEFAULT_WIDTH = 640
+PLACEHOLDER_ID = 'placeholder'
+# Stored images are scaled down to this width and re-encoded as JPEG.
+MAX_IMAGE_WIDTH = 1920
+JPEG_QUALITY = 85
+
+
+class CloudinaryImageStorage:
+    """
+    Stores images in Cloudinary, which scales the variants on request.
+    """
+    def save(self, content):
+        """
+        Uploads the image and returns its value for featured_image.
+        """
+        resource = uploader.upload_resource(content, resource_type='image')
+        return resource.get_prep_value()
+
+    def variant_urls(self, image):
+        return {
+            str(width): image.build_url(
+                width=width, crop='limit', quality='auto',
+                fetch_format='auto',
+            )
+            for width in THUMBNAIL_WIDTHS
+        }
+
+
+class LocalImageStorage:
+    """
+    Stores images under MEDIA_ROOT, for tests and development without
+    Cloudinary. Variants are not scaled; each is the stored image.
+    """
+    def __init__(self):
+        self.storage = FileSystemStorage(
+            location=os.path.join(settings.MEDIA_ROOT, 'event-images'),
+            base_url=f'{settings.MEDIA_URL}event-images/',
+        )
+
+    def save(self, content):
+        return self.storage.save(
+            f'{uuid.uuid4().hex}.jpg', ContentFile(content.getvalue())
+        )
+
+    def variant_urls(self, image):
+        name = image.public_id
+        if image.format:
+            name = f'{name}.{image.format}'
+        url = self.storage.url(name)
+        return {str(width): url for width in THUMBNAIL_WIDTHS}
+
+
+def get_image_storage():
+    """
+    Returns an instance of the storage named by EVENT_IMAGE_STORAGE.
+    """
+    return import_string(settings.EVENT_IMAGE_STORAGE)()
+
+
+def build_variants(image):
+    """
+    Returns whether the image is the placeholder and a dict of
+    thumbnail width, as a string, to URL. The image is a stored
+    CloudinaryResource or its public id.
+    """
+    if not image:
+        return True, {}
+    if not isinstance(image, CloudinaryResource):
+        image = CloudinaryResource(str(image))
+    if PLACEHOLDER_ID in (image.public_id or ''):
+        return True, {}
+    return False, get_image_storage().variant_urls(image)
+
+
+def srcset(variants):
+    """
+    Returns the srcset attribute value for the stored variants.
+    """
+    return ', '.join(
+        f'{url} {width}w'
+        for width, url in sorted(
+            variants.items(), key=lambda item: int(item[0])
+        )
+    )
+
+
+def normalize_image(image_file):
+    """
+    Returns the image in the file as JPEG data in a BytesIO: rotated
+    upright, without metadata, no wider than MAX_IMAGE_WIDTH and with
+    any transparency flattened onto white. Raises PIL's errors for
+    files that are not images.
+    """
+    with Image.open(image_file) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > MAX_IMAGE_WIDTH:
+            height = round(image.height * MAX_IMAGE_WIDTH / image.width)
+            image = image.resize(
+                (MAX_IMAGE_WIDTH, height), Image.Resampling.LANCZOS
+            )
+        if image.mode != 'RGB':
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        output = BytesIO()
+        image.save(
+            output, 'JPEG', quality=JPEG_QUALITY, optimize=True,
+            progressive=True,
+        )
+    output.seek(0)
+    output.name = 'image.jpg'
+    return output
@@ -0,0 +1,182 @@
+"""
+A small database-backed job queue for work that should not hold up
+a request.
+
+Code enqueues a job by name with a JSON payload, normally inside the
+transaction making the change the job follows up on, and the run_worker
+command claims due jobs in batches and calls the handler registered for
+each name. Failed jobs are retried with exponential backoff until they
+run out of attempts.
+"""
+import traceback
+import uuid
+from datetime import timedelta
+from django.db import connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Job, JOB_FAILED, JOB_PENDING, JOB_RUNNING
+
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+# A job still running after this long is assumed to belong to a worker
+# that died, and is claimed again.
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+handlers = {}
+
+
+def job(name):
+    """
+    Registers the decorated function as the handler of the named job.
+    It is called with the job's payload as keyword arguments.
+    """
+    def register(function):
+        handlers[name] = function
+        return function
+    return register
+
+
+def enqueue(name, **payload):
+    """
+    Stores a job for the worker. The payload must be JSON-serializable.
+    """
+    if name not in handlers:
+        raise ValueError(f"Unknown job: {name!r}.")
+    return Job.objects.create(name=name, payload=payload)
+
+
+def retry_delay(attempts):
+    """
+    Returns how long to wait before the next attempt of a job that has
+    failed the given number of times.
+    """
+    return min(RETRY_DELAY * 2 ** min(attempts - 1, 16), MAX_RETRY_DELAY)
+
+
+def abandoned(now):
+    return Q(status=JOB_RUNNING, locked_at__lt=now - LOCK_TIMEOUT)
+
+
+def claimable(now):
+    return (
+        Q(status=JOB_PENDING, run_after__lte=now) |
+        (abandoned(now) & Q(attempts__lt=F('max_attempts')))
+    )
+
+
+def fail_abandoned_jobs(using, now):
+    """
+    Marks abandoned jobs that have used up their attempts as failed.
+    A job that kills its worker never gets to record its failure, so
+    it would otherwise be claimed again forever.
+    """
+    return (
+        Job.objects.using(using)
+        .filter(abandoned(now), attempts__gte=F('max_attempts'))
+        .update(
+            status=JOB_FAILED, lock_token='', locked_at=None,
+            last_error="The worker stopped while running the job.",
+        )
+    )
+
+
+def claim_jobs(batch_size):
+    """
+    Claims up to batch_size due jobs for this worker and returns them.
+    Jobs abandoned by a dead worker are claimed again until they run
+    out of attempts, and then marked as failed.
+
+    On databases with SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL),
+    concurrent workers lock disjoint sets of rows without waiting on
+    each other. Elsewhere (SQLite) the candidate rows are claimed with
+    one UPDATE that checks they are still claimable; SQLite runs writes
+    one at a time, so each job is only ever claimed by one worker.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    using = router.db_for_write(Job)
+    fail_abandoned_jobs(using, now)
+    due = (
+        Job.objects.using(using)
+        .filter(claimable(now))
+        .order_by('run_after', 'id')
+    )
+    claim = {
+        'status': JOB_RUNNING,
+        'lock_token': token,
+        'locked_at': now,
+        'attempts': F('attempts') + 1,
+    }
+    if connections[using].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=using):
+            ids = list(
+                due.select_for_update(skip_locked=True)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            Job.objects.using(using).filter(pk__in=ids).update(**claim)
+    else:
+        ids = list(due.values_list('id', flat=True)[:batch_size])
+        due.filter(pk__in=ids).update(**claim)
+    return list(
+        Job.objects.using(using)
+        .filter(pk__in=ids, lock_token=token)
+        .order_by('run_after', 'id')
+    )
+
+
+def run_jobs(jobs):
+    """
+    Runs claimed jobs and records the outcome of each: finished jobs are
+    deleted in one query, failed ones are scheduled for a retry or
+    marked as failed. Returns the numbers of finished and failed jobs.
+    """
+    finished = []
+    failed = 0
+    for claimed in jobs:
+        try:
+            handler = handlers[claimed.name]
+        except KeyError:
+            record_failure(claimed, f"Unknown job: {claimed.name!r}.")
+            failed += 1
+            continue
+        try:
+            handler(**claimed.payload)
+        except Exception as error:
+            record_failure(
+                claimed, ''.join(traceback.format_exception(error))
+            )
+            failed += 1
+        else:
+            finished.append(claimed.pk)
+    if finished:
+        Job.objects.filter(
+            pk__in=finished, lock_token=jobs[0].lock_token
+        ).delete()
+    return len(finished), failed
+
+
+def record_failure(claimed, error):
+    """
+    Schedules another attempt of a failed job after a growing delay,
+    or marks it as failed once it has used up its attempts.
+    """
+    if claimed.attempts >= claimed.max_attempts:
+        outcome = {'status': JOB_FAILED}
+    else:
+        outcome = {
+            'status': JOB_PENDING,
+            'run_after': timezone.now() + retry_delay(claimed.attempts),
+        }
+    # The token check leaves the job alone if it timed out and was
+    # claimed again by another worker in the meantime.
+    Job.objects.filter(pk=claimed.pk, lock_token=claimed.lock_token).update(
+        last_error=error, lock_token='', locked_at=None, **outcome
+    )
+
+
+def process_batch(batch_size):
+    """
+    Claims and runs one batch of jobs. Returns the numbers of finished
+    and failed jobs, which are both zero when no job was due.
+    """
+    return run_jobs(claim_jobs(batch_size))
@@ -0,0 +1,89 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+from .models import EventRegistration
+
+
+async def run_concurrently(*functions):
+    """
+    Runs sync ORM functions at the same time and returns their results.
+
+    Django's async ORM runs every query on the request's one sync thread,
+    so awaiting several at once still runs them one after another. Each
+    function here gets a worker thread and a database connection of its
+    own instead, which is closed again when the function returns.
+    """
+    def in_own_connection(function):
+        def run():
+            try:
+                return function()
+            finally:
+                connections.close_all()
+        return sync_to_async(run, thread_sensitive=False)()
+
+    return await asyncio.gather(*map(in_own_connection, functions))
+
+
+class EventDetailsLoader:
+    """
+    Loads the data shown on an event details page at most once per request:
+    the event, its roster and the current user's registration.
+    Each piece is fetched lazily, so POST actions that only need the
+    event do not pay for the roster.
+    """
+    def __init__(self, queryset, slug, user):
+        self.queryset = queryset
+        self.slug = slug
+        self.user = user
+
+    @cached_property
+    def event(self):
+        return get_object_or_404(self.queryset, slug=self.slug)
+
+    @cached_property
+    def registrations(self):
+        """
+        Returns the event's registrations with their users joined in.
+        The event is matched by slug, so the roster can be fetched
+        before or alongside the event itself.
+        """
+        return list(
+            EventRegistration.objects
+            .select_related('user')
+            .filter(event__slug=self.slug)
+        )
+
+    async def aload(self, registrations=True):
+        """
+        Loads the event and, if asked, the roster without blocking the
+        event loop, fetching the two concurrently when neither has been
+        loaded yet. Raises Http404 if there is no such event.
+        """
+        names = ['event'] + (['registrations'] if registrations else [])
+        missing = [name for name in names if name not in self.__dict__]
+        if missing:
+            await run_concurrently(*(
+                lambda name=name: getattr(self, name) for name in missing
+            ))
+
+    @cached_property
+    def user_registration(self):
+        """
+        Returns the current user's registration, or None.
+        Reuses the roster when it has already been loaded.
+        """
+        if not self.user.is_authenticated:
+            return None
+        if 'registrations' in self.__dict__:
+            return next(
+                (registration for registration in self.registrations
+                 if registration.user_id == self.user.pk),
+                None
+            )
+        return (
+            EventRegistration.objects
+            .filter(event=self.event, user=self.user)
+            .first()
+        )
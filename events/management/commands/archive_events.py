@@ -0,0 +1,134 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from events.models import ArchivedEvent, ArchivedRegistration, Event
+from events.models import EventRegistration
+
+ARCHIVED_EVENT_FIELDS = [
+    field.attname for field in ArchivedEvent._meta.concrete_fields
+    if field.name != 'archived_at'
+]
+ARCHIVED_REGISTRATION_FIELDS = ArchivedRegistration._meta.concrete_fields
+
+
+def copy_registrations(event_ids):
+    """
+    Copies the registrations of the given events to the archive with
+    one INSERT ... SELECT, so they never pass through Python, and
+    returns how many were copied.
+    """
+    using = router.db_for_write(ArchivedRegistration)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = ARCHIVED_REGISTRATION_FIELDS
+    rows = (
+        EventRegistration.objects.using(using)
+        .filter(event_id__in=event_ids)
+        .order_by()
+        .values_list(*(field.attname for field in fields))
+    )
+    select, params = rows.query.get_compiler(using).as_sql()
+    columns = ', '.join(quote(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(ArchivedRegistration._meta.db_table)} '
+            f'({columns}) {select}', params,
+        )
+        return cursor.rowcount
+
+
+class Command(BaseCommand):
+    """
+    Moves events that took place before a cutoff, with their
+    registrations, from the live tables to the archive tables, so the
+    live tables only hold recent and upcoming events.
+    Each chunk of events is copied and deleted in its own transaction,
+    so the command can be stopped and rerun at any point, and locks are
+    held briefly. The past events listing shows both tiers.
+    """
+    help = "Moves old events and their registrations to the archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help="Archive events more than this many days old.",
+        )
+        parser.add_argument(
+            '--before', type=date.fromisoformat,
+            help="Archive events before this date (YYYY-MM-DD) instead.",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help="Events moved per transaction.",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Report what would be archived without moving it.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = options['before'] or (
+            date.today() - timedelta(days=options['days'])
+        )
+        if cutoff > date.today():
+            raise CommandError(
+                f"Cannot archive events before {cutoff}: upcoming events "
+                f"must stay live."
+            )
+        if options['dry_run']:
+            events = Event.objects.filter(date__lt=cutoff)
+            registrations = EventRegistration.objects.filter(
+                event__date__lt=cutoff
+            )
+            self.stdout.write(
+                f"Would archive {events.count()} event(s) and "
+                f"{registrations.count()} registration(s) before {cutoff}."
+            )
+            return
+
+        events = registrations = 0
+        while True:
+            moved_events, moved_registrations = self.archive_chunk(
+                cutoff, options['chunk_size']
+            )
+            if not moved_events:
+                break
+            events += moved_events
+            registrations += moved_registrations
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Archived {events} event(s) so far.")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {events} event(s) and {registrations} "
+            f"registration(s) before {cutoff}."
+        ))
+
+    def archive_chunk(self, cutoff, chunk_size):
+        """
+        Copies the oldest chunk of events before the cutoff and their
+        registrations to the archive and deletes them from the live
+        tables. Returns the numbers of events and registrations moved.
+        """
+        with transaction.atomic():
+            events = list(
+                Event.objects
+                .select_for_update()
+                .filter(date__lt=cutoff)
+                .order_by('date', 'id')[:chunk_size]
+            )
+            if not events:
+                return 0, 0
+            ids = [event.pk for event in events]
+            ArchivedEvent.objects.bulk_create([
+                ArchivedEvent(**{
+                    name: getattr(event, name)
+                    for name in ARCHIVED_EVENT_FIELDS
+                })
+                for event in events
+            ])
+            registrations = copy_registrations(ids)
+            # Deleting through the ORM removes the registrations too and
+            # sends the signals that drop the events from the search
+            # index and invalidate the cached listings.
+            Event.objects.filter(pk__in=ids).delete()
+        return len(events), registrations
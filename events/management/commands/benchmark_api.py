@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from events.benchmarking import benchmark_client, cold_cache, measure
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """
+    Compares the per-request cost of the JSON API with the HTML views
+    serving the same data, against the current database. With
+    --cold-cache the cache is cleared before every request, so both
+    sides do their full work instead of answering from the page cache;
+    this is refused when the cache is shared, such as Redis.
+    """
+    help = "Benchmarks the JSON API against the equivalent HTML views."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help="Number of requests per URL.",
+        )
+        parser.add_argument(
+            '--cold-cache', action='store_true',
+            help="Clear the local cache before every request.",
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        before_each = None
+        if options['cold_cache']:
+            try:
+                before_each = cold_cache()
+            except ValueError as error:
+                raise CommandError(error)
+        event = (
+            Event.objects
+            .filter(status=1)
+            .order_by('-registration_count', 'id')
+            .first()
+        )
+        if event is None:
+            raise CommandError(
+                "There are no published events to benchmark."
+            )
+
+        comparisons = (
+            ("Upcoming events", reverse('home'),
+             reverse('api_upcoming_events')),
+            ("Past events", reverse('past_events'),
+             reverse('api_past_events')),
+            ("Event details", reverse('event_details', args=[event.slug]),
+             reverse('api_event_details', args=[event.slug])),
+            ("Roster", reverse('event_details', args=[event.slug]),
+             reverse('api_event_registrations', args=[event.slug])),
+        )
+        client = benchmark_client()
+        for name, html_url, api_url in comparisons:
+            html = measure(client, html_url, options['requests'], before_each)
+            api = measure(client, api_url, options['requests'], before_each)
+            self.stdout.write(name)
+            for label, result in (("HTML", html), ("JSON", api)):
+                self.stdout.write(
+                    f"  {label}: mean {result['mean_ms']:.2f} ms, "
+                    f"p95 {result['p95_ms']:.2f} ms, "
+                    f"{result['queries']} queries, "
+                    f"{result['bytes'] / 1024:.1f} kB"
+                )
+            speedup = html['mean_ms'] / api['mean_ms']
+            self.stdout.write(self.style.SUCCESS(
+                f"  JSON is {speedup:.1f}x the speed of HTML."
+            ))
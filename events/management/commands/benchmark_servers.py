@@ -0,0 +1,129 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from events.benchmarking import fetch, run_load
+from events.models import Event
+
+HOST = '127.0.0.1'
+SERVERS = (
+    ('WSGI', ['eventease.wsgi']),
+    ('ASGI', ['eventease.asgi', '-k', 'uvicorn.workers.UvicornWorker']),
+)
+
+
+class Command(BaseCommand):
+    """
+    Starts the site under gunicorn twice, once with sync WSGI workers
+    and once with uvicorn ASGI workers, using the same number of worker
+    processes and the current database, and loads each with the same
+    concurrent requests to compare throughput and p99 latency.
+    Requests are anonymous, so the listings are mostly answered from the
+    page cache while the event details are rendered every time.
+    Each worker logs how many database connections it opened and reused
+    when the server stops.
+    """
+    help = "Compares throughput and p99 latency of WSGI and ASGI servers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=2,
+            help="Worker processes per server.",
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=16,
+            help="Requests kept in flight at once.",
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help="Seconds to load each URL for.",
+        )
+        parser.add_argument(
+            '--connections', choices=('close', 'persistent', 'pool'),
+            help="How the servers reuse database connections; by "
+                 "default WSGI keeps them per thread and ASGI pools them.",
+        )
+        parser.add_argument(
+            '--port', type=int, default=8765,
+            help="Local port the servers listen on.",
+        )
+
+    def handle(self, *args, **options):
+        event = (
+            Event.objects
+            .filter(status=1)
+            .order_by('-registration_count', 'id')
+            .first()
+        )
+        if event is None:
+            raise CommandError(
+                "There are no published events to benchmark."
+            )
+        paths = (
+            reverse('home'),
+            reverse('past_events'),
+            reverse('event_details', args=[event.slug]),
+        )
+
+        for name, arguments in SERVERS:
+            self.stdout.write(f"{name} ({' '.join(arguments)})")
+            server = self.start_server(arguments, options)
+            try:
+                for path in paths:
+                    result = asyncio.run(run_load(
+                        HOST, options['port'], path,
+                        options['concurrency'], options['duration'],
+                    ))
+                    self.report(result)
+            finally:
+                server.terminate()
+                server.wait()
+
+    def start_server(self, arguments, options):
+        """
+        Starts gunicorn with the given application arguments and waits
+        until it accepts requests.
+        """
+        env = dict(os.environ)
+        env.pop('EVENTEASE_ASYNC_VIEWS', None)
+        env.pop('DATABASE_CONNECTIONS', None)
+        if options['connections']:
+            env['DATABASE_CONNECTIONS'] = options['connections']
+        env['EVENTEASE_DB_LOG_LEVEL'] = 'INFO'
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', *arguments,
+                '--workers', str(options['workers']),
+                '--bind', f"{HOST}:{options['port']}",
+                '--log-level', 'warning',
+            ],
+            env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("The server failed to start.")
+            try:
+                asyncio.run(fetch(HOST, options['port'], reverse('about')))
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError("The server did not start within 30 seconds.")
+
+    def report(self, result):
+        if not result['requests']:
+            self.stdout.write(self.style.ERROR(
+                f"  {result['path']}: every request failed."
+            ))
+            return
+        self.stdout.write(
+            f"  {result['path']}: "
+            f"{result['requests_per_second']:.0f} requests/s, "
+            f"p50 {result['p50_ms']:.1f} ms, "
+            f"p99 {result['p99_ms']:.1f} ms, "
+            f"{result['errors']} errors"
+        )
@@ -0,0 +1,235 @@
+import json
+from datetime import datetime, timezone
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.test.utils import override_settings, setup_databases
+from django.test.utils import teardown_databases
+from django.urls import reverse
+from events import urls
+from events.benchmarking import benchmark_client, cold_cache, measure
+from events.benchmarking import measure_memory
+from events.ical import feed_token
+from events.models import Event
+
+# Views measured as the creator of the benchmarked event instead of an
+# anonymous visitor.
+SIGNED_IN = {'event_create', 'registration_export'}
+QUERY_STRINGS = {'event_search': 'q=python'}
+# Results compared with the baseline, relative to the threshold.
+COMPARED = ('p50_ms', 'p95_ms', 'memory_bytes')
+# Options passed on to seed_perf_data, which a baseline must share.
+DATASET_OPTIONS = ('users', 'events', 'registrations', 'seed')
+# The views run against a cache of their own, so the benchmark neither
+# reads nor fills a shared cache such as Redis.
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark-views',
+    },
+}
+
+
+class Command(BaseCommand):
+    """
+    Times every URL in events/urls.py in-process with the test client.
+
+    Like the test runner, the command creates a throwaway test database
+    next to the configured one and fills it with seed_perf_data, so the
+    same options always measure the same data and the real database is
+    never written to; the replica is not used. The views also get a
+    private in-memory cache, which --cold-cache empties before every
+    request. For each view the command reports the latency percentiles,
+    the queries per request and the peak memory allocated by one
+    request, traced with tracemalloc.
+
+    The results can be saved as JSON with --output and compared with an
+    earlier run with --baseline. The command fails if a view got slower
+    or used more memory by more than --threshold percent, or made more
+    queries than before.
+    """
+    help = "Benchmarks every page, feed and API view of the events app."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=50,
+            help="Number of timed requests per URL.",
+        )
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--events', type=int, default=2000)
+        parser.add_argument('--registrations', type=int, default=50000)
+        parser.add_argument(
+            '--seed', type=int, default=1,
+            help="Seed for the generated data.",
+        )
+        parser.add_argument(
+            '--cold-cache', action='store_true',
+            help="Clear the cache before every request.",
+        )
+        parser.add_argument(
+            '--output',
+            help="Write the results to this JSON file.",
+        )
+        parser.add_argument(
+            '--baseline',
+            help="Compare the results with this JSON file.",
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=20,
+            help="Allowed slowdown or memory growth in percent.",
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as baseline_file:
+                    baseline = json.load(baseline_file)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Cannot read the baseline: {error}")
+        dataset = {name: options[name] for name in DATASET_OPTIONS}
+        if baseline is not None and baseline.get('dataset') != dataset:
+            raise CommandError(
+                f"The baseline was measured on different data: "
+                f"{baseline.get('dataset')}."
+            )
+
+        verbosity = max(options['verbosity'] - 1, 0)
+        old_config = setup_databases(
+            verbosity, interactive=False, aliases={DEFAULT_DB_ALIAS},
+            serialized_aliases=set(),
+        )
+        try:
+            with override_settings(
+                CACHES=BENCHMARK_CACHES, REPLICA_DATABASE=None
+            ):
+                call_command(
+                    'seed_perf_data', verbosity=verbosity,
+                    stdout=self.stdout if verbosity else StringIO(),
+                    **dataset,
+                )
+                results = self.measure_views(options)
+        finally:
+            teardown_databases(old_config, verbosity)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({
+                    'created': datetime.now(timezone.utc).isoformat(),
+                    'requests': options['requests'],
+                    'cold_cache': options['cold_cache'],
+                    'dataset': dataset,
+                    'views': results,
+                }, output, indent=2, sort_keys=True)
+                output.write('\n')
+            self.stdout.write(f"Results written to {options['output']}.")
+        if baseline is not None:
+            self.compare(results, baseline['views'], options['threshold'])
+
+    def measure_views(self, options):
+        """
+        Measures every URL and returns a dict of URL name to results.
+        """
+        event = (
+            Event.objects
+            .filter(status=1)
+            .select_related('created_by')
+            .order_by('-registration_count', 'id')
+            .first()
+        )
+        if event is None:
+            raise CommandError(
+                "The generated data has no published events to benchmark."
+            )
+
+        anonymous = benchmark_client()
+        signed_in = benchmark_client()
+        signed_in.force_login(event.created_by)
+        before_each = cold_cache() if options['cold_cache'] else None
+        results = {}
+        for name, url in self.get_urls(event):
+            client = signed_in if name in SIGNED_IN else anonymous
+            try:
+                result = measure(
+                    client, url, options['requests'], before_each
+                )
+                result['memory_bytes'] = measure_memory(
+                    client, url, before_each
+                )
+            except ValueError as error:
+                raise CommandError(f"{name}: {error}")
+            results[name] = result
+            self.stdout.write(
+                f"{name}: p50 {result['p50_ms']:.2f} ms, "
+                f"p95 {result['p95_ms']:.2f} ms, "
+                f"p99 {result['p99_ms']:.2f} ms, "
+                f"{result['queries']} queries, "
+                f"{result['memory_bytes'] / 1024:.0f} kB allocated"
+            )
+        return results
+
+    def get_urls(self, event):
+        """
+        Yields the name and URL of every named pattern in events/urls.py,
+        with arguments pointing at the benchmarked event and its creator.
+        """
+        arguments = {
+            'slug': event.slug,
+            'token': feed_token(event.created_by),
+        }
+        for pattern in urls.urlpatterns:
+            converters = pattern.pattern.converters
+            missing = set(converters) - set(arguments)
+            if missing:
+                raise CommandError(
+                    f"No benchmark value for the {', '.join(missing)} "
+                    f"argument of {pattern.name}."
+                )
+            url = reverse(pattern.name, kwargs={
+                argument: arguments[argument] for argument in converters
+            })
+            if pattern.name in QUERY_STRINGS:
+                url = f'{url}?{QUERY_STRINGS[pattern.name]}'
+            yield pattern.name, url
+
+    def compare(self, results, baseline, threshold):
+        """
+        Reports the change of each view against the baseline and raises
+        CommandError listing the regressions.
+        """
+        regressions = []
+        limit = 1 + threshold / 100
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                self.stdout.write(f"{name}: not in the baseline.")
+                continue
+            changes = []
+            for key in COMPARED:
+                change = result[key] / before[key] - 1 if before[key] else 0
+                changes.append(f"{key} {change:+.0%}")
+                if result[key] > before[key] * limit:
+                    regressions.append(
+                        f"{name} {key}: {before[key]:.2f} -> "
+                        f"{result[key]:.2f}"
+                    )
+            if result['queries'] > before['queries']:
+                regressions.append(
+                    f"{name} queries: {before['queries']} -> "
+                    f"{result['queries']}"
+                )
+            changes.append(
+                f"queries {result['queries'] - before['queries']:+d}"
+            )
+            self.stdout.write(f"{name}: {', '.join(changes)}")
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regression(s) beyond {threshold:g}%:\n"
+                + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"No regressions beyond {threshold:g}%."
+        ))
@@ -0,0 +1,146 @@
+import csv
+import json
+import time
+from itertools import islice
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from events.forms import EventCreateForm
+from events.models import Event, SLUG_SAVE_ATTEMPTS
+
+
+def read_csv(stream):
+    """
+    Yields (line number, row) pairs from a CSV file with a header row.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(stream):
+    """
+    Yields (line number, row) pairs from a file with one JSON object
+    per line, skipping blank lines.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield line_number, error
+            continue
+        yield line_number, row
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+class Command(BaseCommand):
+    """
+    Imports events from a CSV or JSONL file in fixed-size chunks.
+    Rows are validated with the same rules as EventCreateForm and each
+    chunk is inserted with one bulk_create inside its own transaction,
+    so memory use depends on the chunk size, not on the file size.
+    """
+    help = "Imports events from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file to import.")
+        parser.add_argument(
+            '--format', choices=sorted(READERS),
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            '--created-by', required=True,
+            help="Username recorded as the creator of the events.",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help="Number of rows validated and inserted per transaction.",
+        )
+        parser.add_argument(
+            '--approve', action='store_true',
+            help="Publish the imported events instead of leaving them "
+                 "pending.",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in READERS:
+            raise CommandError(
+                f"Cannot tell the format of {path}; use --format."
+            )
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        try:
+            creator = User.objects.get(username=options['created_by'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['created_by']}.")
+        status = 1 if options['approve'] else 0
+
+        imported = rejected = 0
+        started = time.perf_counter()
+        with open(path, newline='', encoding='utf-8') as stream:
+            rows = READERS[file_format](stream)
+            while True:
+                chunk = list(islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                events = []
+                for line_number, row in chunk:
+                    event = self.build_event(line_number, row)
+                    if event is None:
+                        rejected += 1
+                        continue
+                    event.created_by = creator
+                    event.status = status
+                    events.append(event)
+                self.insert_chunk(events)
+                imported += len(events)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"Imported {imported} rows...")
+
+        elapsed = time.perf_counter() - started
+        rate = imported / elapsed if elapsed else imported
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} event(s), rejected {rejected}, "
+            f"in {elapsed:.2f}s ({rate:.0f} rows/s)."
+        ))
+
+    def build_event(self, line_number, row):
+        """
+        Validates a row with EventCreateForm and returns an unsaved event,
+        or reports the errors and returns None.
+        """
+        if not isinstance(row, dict):
+            self.stderr.write(f"Line {line_number}: invalid row ({row}).")
+            return None
+        form = EventCreateForm(data=row)
+        if not form.is_valid():
+            errors = '; '.join(
+                f"{field}: {' '.join(messages)}"
+                for field, messages in form.errors.items()
+            )
+            self.stderr.write(f"Line {line_number}: {errors}")
+            return None
+        return form.save(commit=False)
+
+    def insert_chunk(self, events):
+        """
+        Inserts one chunk of events in a transaction. If a concurrent
+        writer takes one of the allocated slugs, the slugs are allocated
+        again and the chunk is retried.
+        """
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    Event.objects.bulk_create(events)
+                return
+            except IntegrityError:
+                if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
+                for event in events:
+                    event.slug = ''
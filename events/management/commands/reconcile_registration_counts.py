@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from events.cache import bump_listings_generation
+from events.models import Event, EventRegistration
+
+
+class Command(BaseCommand):
+    """
+    Recomputes Event.registration_count from the EventRegistration rows
+    and fixes any events whose stored counter has drifted.
+    """
+    help = "Reconciles Event.registration_count with actual registrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Report drifted events without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Event.objects
+            .annotate(actual=Count('registrations'))
+            .exclude(registration_count=F('actual'))
+            .order_by('pk')
+            .values_list('pk', 'title', 'registration_count', 'actual')
+        )
+        for pk, title, stored, actual in drifted:
+            self.stdout.write(
+                f"Event {pk} ({title}): stored {stored}, actual {actual}"
+            )
+
+        if drifted and not options['dry_run']:
+            # Count again inside the UPDATE so registrations made since
+            # the scan above are not lost.
+            actual = (
+                EventRegistration.objects
+                .filter(event=OuterRef('pk'))
+                .order_by()
+                .values('event')
+                .annotate(total=Count('pk'))
+                .values('total')
+            )
+            Event.objects.filter(
+                pk__in=[pk for pk, *_ in drifted]
+            ).update(registration_count=Coalesce(Subquery(actual), 0))
+            bump_listings_generation()
+
+        verb = "Found" if options['dry_run'] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(drifted)} event(s) with a drifted count."
+        ))
@@ -0,0 +1,61 @@
+import signal
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from events.jobs import process_batch
+
+
+class Command(BaseCommand):
+    """
+    Runs background jobs until stopped. Due jobs are claimed in batches,
+    so several workers can run side by side; when none are due the
+    worker sleeps before looking again. SIGTERM and SIGINT stop it once
+    the current batch is done.
+    """
+    help = "Runs queued background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10,
+            help="Number of jobs claimed at a time.",
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help="Seconds to wait when no job is due.",
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Run the jobs that are due and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        self.stopping = False
+        if not options['once']:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        total_finished = total_failed = 0
+        while not self.stopping:
+            finished, failed = process_batch(options['batch_size'])
+            total_finished += finished
+            total_failed += failed
+            if finished or failed:
+                if options['verbosity'] > 1:
+                    self.stdout.write(
+                        f"Finished {finished} job(s), {failed} failed."
+                    )
+            elif options['once']:
+                break
+            else:
+                # Drop a connection that has expired or broken while idle.
+                close_old_connections()
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Finished {total_finished} job(s), {total_failed} failed."
+        ))
+
+    def stop(self, signum, frame):
+        self.stopping = True
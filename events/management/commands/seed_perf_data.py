@@ -0,0 +1,243 @@
+import random
+import time
+from itertools import islice
+from datetime import date, time as clock, timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from events.models import ContactMessage, Event, EventRegistration
+
+USERNAME_PREFIX = 'perf-user-'
+PASSWORD = 'perf-password'
+FIRST_NAMES = (
+    'Anna', 'Ben', 'Chloe', 'David', 'Elif', 'Felix', 'Grace', 'Hamza',
+    'Ines', 'Jonas', 'Kira', 'Leon', 'Maya', 'Noah', 'Olga', 'Paul',
+    'Quinn', 'Rosa', 'Samir', 'Tara', 'Umut', 'Vera', 'Wen', 'Yusuf',
+)
+LAST_NAMES = (
+    'Schmidt', 'Meyer', 'Yilmaz', 'Nowak', 'Rossi', 'Garcia', 'Kim',
+    'Okafor', 'Silva', 'Jensen', 'Dubois', 'Novak', 'Khan', 'Weber',
+)
+CITIES = (
+    'Berlin', 'Hamburg', 'Munich', 'Cologne', 'Frankfurt', 'Stuttgart',
+    'Leipzig', 'Dresden', 'Vienna', 'Zurich', 'Amsterdam', 'Prague',
+    'Copenhagen', 'Warsaw', 'Lisbon', 'Dublin', 'Online',
+)
+TOPICS = (
+    'Python', 'Django', 'JavaScript', 'Data Science', 'Startup', 'Design',
+    'Photography', 'Running', 'Board Game', 'Book Club', 'Language',
+    'Open Source', 'Cloud', 'Security', 'Product', 'Jazz', 'Yoga',
+    'Cooking', 'Climbing', 'Chess',
+)
+KINDS = (
+    'Meetup', 'Workshop', 'Night', 'Conference', 'Hackathon',
+    'Social', 'Talk', 'Study Group',
+)
+QUALIFIERS = ('Weekly', 'Monthly', 'Summer', 'Winter', 'Beginners', '')
+
+
+class Command(BaseCommand):
+    """
+    Fills the database with synthetic users, events, registrations and
+    contact messages for performance testing.
+
+    The data is generated from a seeded random number generator, so the
+    same options always produce the same rows, with event dates relative
+    to the day the command runs. Event titles are drawn
+    from a small pool with a skewed distribution, so popular titles such
+    as "Weekly Python Meetup" repeat hundreds of times and exercise slug
+    collisions, and registrations are concentrated on a few popular
+    events. Rows are inserted with bulk_create in batches, each in its
+    own transaction, and every user gets the password "perf-password".
+    """
+    help = "Generates a large, deterministic dataset for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--events', type=int, default=2000)
+        parser.add_argument('--registrations', type=int, default=50000)
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument(
+            '--seed', type=int, default=1,
+            help="Seed for the random number generator.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Rows inserted per query and transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options['users'] < 1 and options['events'] > 0:
+            raise CommandError("Events need at least one user.")
+        if User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError(
+                "The database already has generated data; seed an empty "
+                "database to get the same rows again."
+            )
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        started = time.perf_counter()
+
+        events = self.plan_events(options['events'], options['users'])
+        counts = self.plan_registrations(
+            events, options['registrations'], options['users']
+        )
+        user_ids = self.create_users(options['users'])
+        event_ids = self.create_events(events, counts, user_ids)
+        registrations = self.create_registrations(
+            event_ids, counts, user_ids
+        )
+        self.create_messages(options['messages'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(user_ids)} user(s), {len(event_ids)} event(s), "
+            f"{registrations} registration(s) and {options['messages']} "
+            f"message(s) in {elapsed:.1f}s."
+        ))
+
+    def insert(self, model, objs):
+        """
+        Inserts objects from an iterable in batches, each in its own
+        transaction, and yields each inserted batch. Objects are built
+        as they are consumed, so memory use depends on the batch size.
+        """
+        inserted = 0
+        objs = iter(objs)
+        while True:
+            batch = list(islice(objs, self.batch_size))
+            if not batch:
+                return
+            with transaction.atomic():
+                batch = model.objects.bulk_create(batch)
+            inserted += len(batch)
+            if self.verbosity > 1:
+                self.stdout.write(
+                    f"Inserted {inserted} {model._meta.verbose_name_plural}."
+                )
+            yield batch
+
+    def create_users(self, number):
+        # Hashing once keeps a million users from taking hours.
+        password = make_password(PASSWORD)
+        batches = self.insert(User, (
+            User(
+                username=f'{USERNAME_PREFIX}{index}',
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'{USERNAME_PREFIX}{index}@example.com',
+                password=password,
+            )
+            for index in range(number)
+        ))
+        return [user.pk for batch in batches for user in batch]
+
+    def plan_events(self, number, users):
+        """
+        Returns the field values of the events to create: two thirds in
+        the past, a tenth still pending, with skewed title popularity.
+        """
+        titles = [
+            ' '.join(filter(None, (qualifier, topic, kind)))
+            for qualifier in QUALIFIERS
+            for topic in TOPICS
+            for kind in KINDS
+        ]
+        self.rng.shuffle(titles)
+        # Zipf-like weights: the first titles are by far the most common.
+        weights = [1 / rank for rank in range(1, len(titles) + 1)]
+        today = date.today()
+        events = []
+        for title in self.rng.choices(titles, weights, k=number):
+            city = self.rng.choice(CITIES)
+            events.append({
+                'title': title,
+                'description': f"{title} in {city}. All levels welcome.",
+                'date': today + timedelta(days=self.rng.randint(-730, 365)),
+                'time': clock(self.rng.randint(8, 21), self.rng.choice(
+                    (0, 15, 30, 45)
+                )),
+                'location': city,
+                'status': 0 if self.rng.random() < 0.1 else 1,
+                'creator': self.rng.randrange(users),
+            })
+        return events
+
+    def plan_registrations(self, events, total, users):
+        """
+        Returns the number of registrations for each event, adding up to
+        total. Popularity follows a heavy-tailed distribution and only
+        published events get registrations, at most one per user.
+        """
+        weights = [
+            self.rng.paretovariate(1.2) if event['status'] == 1 else 0
+            for event in events
+        ]
+        capacity = sum(users for weight in weights if weight)
+        if total > capacity:
+            raise CommandError(
+                f"Cannot create {total} registrations: the published "
+                f"events only have room for {capacity}."
+            )
+        weight_sum = sum(weights) or 1
+        counts = [
+            min(users, int(total * weight / weight_sum))
+            for weight in weights
+        ]
+        # Hand out what rounding and the per-event cap left over,
+        # most popular events first.
+        remaining = total - sum(counts)
+        by_popularity = sorted(
+            range(len(events)), key=lambda index: -weights[index]
+        )
+        while remaining:
+            for index in by_popularity:
+                if remaining and weights[index] and counts[index] < users:
+                    counts[index] += 1
+                    remaining -= 1
+        return counts
+
+    def create_events(self, events, counts, user_ids):
+        batches = self.insert(Event, (
+            Event(
+                title=event['title'],
+                description=event['description'],
+                date=event['date'],
+                time=event['time'],
+                location=event['location'],
+                status=event['status'],
+                created_by_id=user_ids[event['creator']],
+                registration_count=count,
+                capacity=(
+                    None if self.rng.random() < 0.5
+                    else count + self.rng.randint(0, 50)
+                ),
+            )
+            for event, count in zip(events, counts)
+        ))
+        return [event.pk for batch in batches for event in batch]
+
+    def create_registrations(self, event_ids, counts, user_ids):
+        registrations = (
+            EventRegistration(event_id=event_id, user_id=user_ids[index])
+            for event_id, count in zip(event_ids, counts)
+            for index in self.rng.sample(range(len(user_ids)), count)
+        )
+        batches = self.insert(EventRegistration, registrations)
+        return sum(len(batch) for batch in batches)
+
+    def create_messages(self, number):
+        for batch in self.insert(ContactMessage, (
+            ContactMessage(
+                name=f'{self.rng.choice(FIRST_NAMES)} '
+                     f'{self.rng.choice(LAST_NAMES)}',
+                email=f'visitor-{index}@example.com',
+                message=f"Question number {index} about an event.",
+            )
+            for index in range(number)
+        )):
+            pass
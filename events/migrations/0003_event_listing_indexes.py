@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-18 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_featured_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'date', 'time'], name='event_status_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['date', 'time', 'id'], name='event_approved_date_time_idx'),
+        ),
+    ]
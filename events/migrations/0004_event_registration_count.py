@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-18 18:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_registration_counts(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+    counts = (
+        EventRegistration.objects
+        .filter(event=OuterRef('pk'))
+        .order_by()
+        .values('event')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Event.objects.update(registration_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='registration_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            backfill_registration_counts, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 18:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_registration_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum number of attendees. Leave empty for no limit.', null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from events import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_updated_at_roster_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.23 on 2026-10-18 18:59
+
+from django.db import migrations, models
+from events.models import normalize_location
+
+
+def backfill_location_normalized(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    batch = []
+    for event in Event.objects.only('id', 'location').iterator():
+        event.location_normalized = normalize_location(event.location)
+        batch.append(event)
+        if len(batch) == 500:
+            Event.objects.bulk_update(batch, ['location_normalized'])
+            batch = []
+    Event.objects.bulk_update(batch, ['location_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='location_normalized',
+            field=models.CharField(default='', editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            backfill_location_normalized, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['location_normalized', 'date', 'time', 'id'], name='event_approved_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['created_by', 'date', 'time', 'id'], name='event_approved_creator_idx'),
+        ),
+    ]
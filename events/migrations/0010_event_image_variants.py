@@ -0,0 +1,43 @@
+# Generated by Django 4.2.23 on 2026-10-18 19:14
+
+from django.db import migrations, models
+from events.images import build_variants
+
+
+def backfill_image_variants(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    batch = []
+    for event in Event.objects.only('id', 'featured_image').iterator():
+        event.is_placeholder, event.image_variants = build_variants(
+            event.featured_image
+        )
+        batch.append(event)
+        if len(batch) == 500:
+            Event.objects.bulk_update(
+                batch, ['is_placeholder', 'image_variants']
+            )
+            batch = []
+    Event.objects.bulk_update(batch, ['is_placeholder', 'image_variants'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_variants',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='is_placeholder',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_image_variants, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.23 on 2026-10-18 19:31
+
+import cloudinary.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import events.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0010_event_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(max_length=200, unique=True)),
+                ('description', models.TextField()),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('location', models.CharField(max_length=255)),
+                ('location_normalized', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('status', models.IntegerField(choices=[(0, 'Pending'), (1, 'Approved')])),
+                ('featured_image', cloudinary.models.CloudinaryField(default='placeholder', max_length=255, verbose_name='image')),
+                ('image_variants', models.JSONField(default=dict)),
+                ('is_placeholder', models.BooleanField(default=True)),
+                ('capacity', models.PositiveIntegerField(blank=True, null=True)),
+                ('registration_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            bases=(events.models.ImageVariantsMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArchivedRegistration',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('note', models.CharField(blank=True, max_length=255, null=True)),
+                ('registered_at', models.DateTimeField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registrations', to='events.archivedevent')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_registrations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-registered_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['date', 'time', 'id'], name='archived_approved_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['location_normalized', 'date', 'time', 'id'], name='archived_approved_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['created_by', 'date', 'time', 'id'], name='archived_approved_creator_idx'),
+        ),
+    ]
@@ -1,10 +1,86 @@
-from django.db import models
+import re
+from django.db import IntegrityError, models, router, transaction
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
 from django.utils.text import slugify
 from cloudinary.models import CloudinaryField
+from .images import DEFAULT_WIDTH, build_variants, srcset
 
 STATUS = ((0, "Pending"), (1, "Approved"))
 
+JOB_PENDING, JOB_RUNNING, JOB_FAILED = 0, 1, 2
+JOB_STATUS = (
+    (JOB_PENDING, "Pending"), (JOB_RUNNING, "Running"), (JOB_FAILED, "Failed")
+)
+
+
+def normalize_location(location):
+    """
+    Returns the form of a location used for matching: lowercase,
+    with surrounding and repeated whitespace removed.
+    """
+    return ' '.join(location.split()).lower()
+
+
+SLUG_LOOKUP_CHUNK = 200
+SLUG_SAVE_ATTEMPTS = 3
+
+
+def slug_collisions(base_slug):
+    """
+    Returns a filter matching the base slug and its numbered variants,
+    such as "meetup" and "meetup-2" but not "meetup-night". The prefix
+    test lets the database use an index before the regex is checked.
+    """
+    return models.Q(slug=base_slug) | models.Q(
+        slug__startswith=f'{base_slug}-',
+        slug__regex=rf'^{re.escape(base_slug)}-[0-9]+$',
+    )
+
+
+def generate_unique_slugs(titles, model):
+    """
+    Returns a unique slug for each of the given titles, in order.
+    Fetches every existing slug that could collide in one query per
+    SLUG_LOOKUP_CHUNK distinct titles, then appends the lowest free
+    number to each slug in memory, so titles within the batch never
+    collide with each other either.
+    """
+    fallback = model._meta.model_name
+    base_slugs = [slugify(title) or fallback for title in titles]
+    distinct = sorted(set(base_slugs))
+    taken = set()
+    for start in range(0, len(distinct), SLUG_LOOKUP_CHUNK):
+        query = models.Q()
+        for base_slug in distinct[start:start + SLUG_LOOKUP_CHUNK]:
+            query |= slug_collisions(base_slug)
+        slugs = (
+            model.objects.filter(query).order_by()
+            .values_list('slug', flat=True)
+        )
+        if model is Event:
+            # Archived events keep their slugs, so new ones must not
+            # reuse them.
+            slugs = slugs.union(
+                ArchivedEvent.objects.filter(query).order_by()
+                .values_list('slug', flat=True)
+            )
+        taken.update(slugs)
+
+    counters = {}
+    slugs = []
+    for base_slug in base_slugs:
+        slug = base_slug
+        counter = counters.get(base_slug, 1)
+        while slug in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        counters[base_slug] = counter
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
 
 def generate_unique_slug(title, model):
     """
@@ -12,16 +88,55 @@ def generate_unique_slug(title, model):
     by checking existing slugs in the model.
     If the slug already exists, appends a number to make it unique.
     """
-    base_slug = slugify(title)
-    slug = base_slug
-    counter = 1
-    while model.objects.filter(slug=slug).exists():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    return slug
+    return generate_unique_slugs([title], model)[0]
+
+
+class EventQuerySet(models.QuerySet):
+    """
+    QuerySet for events that keeps bulk inserts consistent with save().
+    """
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Allocates slugs for all events without one in a single batch,
+        normalizes locations and builds image variants before inserting
+        them, then indexes them for search.
+        """
+        objs = list(objs)
+        unslugged = [event for event in objs if not event.slug]
+        slugs = generate_unique_slugs(
+            [event.title for event in unslugged], self.model
+        )
+        for event, slug in zip(unslugged, slugs):
+            event.slug = slug
+        for event in objs:
+            event.location_normalized = normalize_location(event.location)
+            event.refresh_image_variants()
+        created = super().bulk_create(objs, *args, **kwargs)
+        # bulk_create bypasses save() and post_save, so index and
+        # invalidate here, like the signals once the insert is committed.
+        # Imported here to avoid circular imports.
+        from .cache import bump_listings_generation
+        from .search import index_events
+        index_events(created, using=self.db)
+        if any(event.status == 1 for event in objs):
+            transaction.on_commit(bump_listings_generation, using=self.db)
+        return created
+
+
+class ImageVariantsMixin:
+    """
+    The image URLs templates use for models with image_variants.
+    """
+    @property
+    def image_src(self):
+        return self.image_variants.get(str(DEFAULT_WIDTH), '')
+
+    @property
+    def image_srcset(self):
+        return srcset(self.image_variants)
 
 
-class Event(models.Model):
+class Event(ImageVariantsMixin, models.Model):
     """
     Represents an event with details such as title, date, location, and status.
     Automatically generates a unique slug on save if not provided.
@@ -32,23 +147,100 @@ class Event(models.Model):
     date = models.DateField()
     time = models.TimeField()
     location = models.CharField(max_length=255)
+    location_normalized = models.CharField(max_length=255, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE,
                                    related_name='created_events')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.IntegerField(choices=STATUS, default=0)
     featured_image = CloudinaryField('image', default='placeholder')
+    image_variants = models.JSONField(default=dict, editable=False)
+    is_placeholder = models.BooleanField(default=True, editable=False)
+    capacity = models.PositiveIntegerField(
+        null=True, blank=True,
+        help_text="Maximum number of attendees. Leave empty for no limit."
+    )
+    registration_count = models.PositiveIntegerField(default=0)
+    roster_version = models.PositiveIntegerField(default=0)
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['status', 'date', 'time'],
+                name='event_status_date_time_idx',
+            ),
+            # Backs the upcoming and past listings, which only ever show
+            # approved events; ignored on backends without partial indexes.
+            models.Index(
+                fields=['date', 'time', 'id'],
+                condition=models.Q(status=1),
+                name='event_approved_date_time_idx',
+            ),
+            # Back the location and creator filters on the listings.
+            models.Index(
+                fields=['location_normalized', 'date', 'time', 'id'],
+                condition=models.Q(status=1),
+                name='event_approved_location_idx',
+            ),
+            models.Index(
+                fields=['created_by', 'date', 'time', 'id'],
+                condition=models.Q(status=1),
+                name='event_approved_creator_idx',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         """
         Overrides the default save method to generate a unique slug
-        from the title if not provided.
+        from the title if not provided, normalize the location, build
+        the image variants and keep the event's search document in sync.
+        """
+        # Imported here because the search module depends on this one.
+        from .search import index_events
+        self.location_normalized = normalize_location(self.location)
+        self.refresh_image_variants()
+        using = kwargs.get('using') or router.db_for_write(
+            Event, instance=self
+        )
+        with transaction.atomic(using=using):
+            if self.slug:
+                super().save(*args, **kwargs)
+            else:
+                self.save_with_new_slug(*args, **kwargs)
+            index_events([self], using=using)
+
+    def refresh_image_variants(self):
         """
-        if not self.slug:
+        Sets is_placeholder and the thumbnail URLs from featured_image.
+        A new upload is sent to Cloudinary first, so the URLs point at
+        the stored image; saving then keeps the uploaded resource.
+        """
+        field = self._meta.get_field('featured_image')
+        if isinstance(self.featured_image, UploadedFile):
+            field.pre_save(self, self._state.adding)
+        self.is_placeholder, self.image_variants = build_variants(
+            field.to_python(self.featured_image)
+        )
+
+    def save_with_new_slug(self, *args, **kwargs):
+        """
+        Saves the event under a newly generated slug, generating another
+        one if a concurrent save takes it first.
+        """
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
             self.slug = generate_unique_slug(self.title, Event)
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                lost_race = Event.objects.filter(slug=self.slug).exists()
+                if not lost_race or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
 
     def __str__(self):
         return self.title
@@ -74,6 +266,76 @@ class EventRegistration(models.Model):
         return f"{self.user.username} registered for {self.event.title}"
 
 
+class ArchivedEvent(ImageVariantsMixin, models.Model):
+    """
+    A read-only copy of a past event moved out of the Event table by the
+    archive_events command, with everything the past events listing
+    shows. It keeps the event's id and slug.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200, unique=True)
+    description = models.TextField()
+    date = models.DateField()
+    time = models.TimeField()
+    location = models.CharField(max_length=255)
+    location_normalized = models.CharField(max_length=255)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE,
+                                   related_name='archived_events')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    status = models.IntegerField(choices=STATUS)
+    featured_image = CloudinaryField('image', default='placeholder')
+    image_variants = models.JSONField(default=dict)
+    is_placeholder = models.BooleanField(default=True)
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    registration_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Back the past events listing and its filters, like the
+            # matching indexes on Event.
+            models.Index(
+                fields=['date', 'time', 'id'],
+                condition=models.Q(status=1),
+                name='archived_approved_date_idx',
+            ),
+            models.Index(
+                fields=['location_normalized', 'date', 'time', 'id'],
+                condition=models.Q(status=1),
+                name='archived_approved_location_idx',
+            ),
+            models.Index(
+                fields=['created_by', 'date', 'time', 'id'],
+                condition=models.Q(status=1),
+                name='archived_approved_creator_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedRegistration(models.Model):
+    """
+    A registration for an archived event, keeping its original id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='archived_registrations')
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE,
+                              related_name='registrations')
+    note = models.CharField(max_length=255, blank=True, null=True)
+    registered_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-registered_at']
+
+    def __str__(self):
+        return f"{self.user.username} registered for {self.event.title}"
+
+
 class ContactMessage(models.Model):
     """
     Stores messages submitted through a contact form,
@@ -86,3 +348,48 @@ class ContactMessage(models.Model):
 
     def __str__(self):
         return f"Message from {self.name} ({self.email})"
+
+
+class Job(models.Model):
+    """
+    A piece of background work for the run_worker command, such as
+    sending a notification mail. Jobs are stored in the database so they
+    are enqueued in the same transaction as the change that caused them.
+    Finished jobs are deleted; jobs that ran out of attempts are kept as
+    failed for inspection.
+    """
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.IntegerField(choices=JOB_STATUS, default=JOB_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    lock_token = models.CharField(max_length=32, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Workers look for pending jobs that are due, oldest first.
+            models.Index(
+                fields=['status', 'run_after', 'id'], name='job_claim_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class StagedImage(models.Model):
+    """
+    An uploaded event image waiting for the process_event_image job.
+    It is stored in the same transaction as the event, so the worker
+    can read it whatever machine it runs on, and deleted once the job
+    has processed it.
+    """
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Staged image {self.pk} ({len(self.data)} bytes)"
@@ -0,0 +1,269 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+# Integer key values outside the range of a 64-bit database column
+# cannot belong to any row, and would make the query itself fail.
+MIN_INTEGER = -2 ** 63
+MAX_INTEGER = 2 ** 63 - 1
+
+
+def encode_cursor(values, backwards=False):
+    """
+    Encodes the ordering key of a row into an opaque, URL-safe cursor.
+    Backwards cursors point at the page before the row instead of after it.
+    """
+    payload = json.dumps(
+        {'k': [str(value) for value in values], 'b': int(backwards)},
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor created by encode_cursor into its raw key values
+    and direction. Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, backwards = payload['k'], bool(payload['b'])
+    except (binascii.Error, UnicodeError, TypeError, KeyError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    # encode_cursor writes every key value as a string.
+    if not isinstance(values, list) or not all(
+        isinstance(value, str) for value in values
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values, backwards
+
+
+class CursorPage:
+    """
+    A single page of keyset-paginated rows.
+    Mirrors the parts of Django's Page API the templates rely on and
+    exposes opaque cursors for the neighbouring pages.
+    """
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @cached_property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return encode_cursor(self.paginator.row_key(self.object_list[-1]))
+
+    @cached_property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return encode_cursor(
+            self.paginator.row_key(self.object_list[0]), backwards=True
+        )
+
+
+class CursorPaginator:
+    """
+    Paginates a queryset by seeking past the last row's ordering key
+    instead of using OFFSET, so every page costs the same as the first.
+
+    The ordering must end with a unique field (normally 'id') and all
+    fields must sort in the same direction, e.g. ('-date', '-time', '-id').
+    The total count is only queried if the count attribute is accessed.
+    """
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.descending = self.ordering[0].startswith('-')
+
+    @cached_property
+    def count(self):
+        return self.queryset.count()
+
+    def row_key(self, row):
+        """
+        Returns the ordering key of a model instance or a values() dict.
+        """
+        if isinstance(row, dict):
+            return [row[name] for name in self.fields]
+        return [getattr(row, name) for name in self.fields]
+
+    def parse_cursor(self, cursor):
+        """
+        Decodes a cursor and converts its values back to Python types
+        using the model fields. Raises ValueError if it is invalid,
+        including integers no database column can hold.
+        """
+        raw_values, backwards = decode_cursor(cursor)
+        if len(raw_values) != len(self.fields):
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+        model = self.queryset.model
+        try:
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, raw_values)
+            ]
+        except (ValidationError, TypeError):
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+        if any(
+            isinstance(value, int) and not MIN_INTEGER <= value <= MAX_INTEGER
+            for value in values
+        ):
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+        return values, backwards
+
+    def _seek_filter(self, values, descending):
+        """
+        Builds the row-value comparison (f1, f2, ...) > (v1, v2, ...)
+        as an OR of prefix equalities. The leading range bound lets the
+        database use the (date, time, id) index for the seek.
+        """
+        lookup = 'lt' if descending else 'gt'
+        condition = Q()
+        for index, name in enumerate(self.fields):
+            prefix = dict(zip(self.fields[:index], values[:index]))
+            prefix[f'{name}__{lookup}'] = values[index]
+            condition |= Q(**prefix)
+        bound = {f"{self.fields[0]}__{lookup}e": values[0]}
+        return Q(**bound) & condition
+
+    def page_queryset(self, cursor=None, queryset=None):
+        """
+        Returns the queryset that fetches the requested page (plus one
+        extra row to detect a following page) and whether it walks
+        backwards. No query is executed. A queryset other than the
+        paginator's can be given, to seek in it by the same cursor.
+        """
+        if queryset is None:
+            queryset = self.queryset
+        backwards = False
+        descending = self.descending
+        if cursor:
+            values, backwards = self.parse_cursor(cursor)
+            descending = descending != backwards
+            queryset = queryset.filter(self._seek_filter(values, descending))
+        ordering = [
+            f"-{name}" if descending else name for name in self.fields
+        ]
+        return queryset.order_by(*ordering)[:self.per_page + 1], backwards
+
+    def page_querysets(self, cursor=None):
+        """
+        Returns the querysets that fetch the requested page, whose rows
+        are combined by merge_rows, and whether it walks backwards.
+        """
+        queryset, backwards = self.page_queryset(cursor)
+        return [queryset], backwards
+
+    def merge_rows(self, row_lists, backwards=False):
+        return list(row_lists[0])
+
+    def build_page(self, rows, cursor=None, backwards=False):
+        """
+        Turns the rows fetched with page_queryset into a CursorPage.
+        """
+        rows = list(rows)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            return CursorPage(rows, self, True, has_more)
+        return CursorPage(rows, self, has_more, bool(cursor))
+
+    def page(self, cursor=None):
+        """
+        Fetches and returns the page identified by the given cursor,
+        or the first page if no cursor is given.
+        """
+        queryset, backwards = self.page_queryset(cursor)
+        return self.build_page(queryset, cursor, backwards)
+
+
+class TieredCursorPaginator(CursorPaginator):
+    """
+    Paginates several querysets as if they were one, such as live events
+    and their archive. The querysets must share the ordering fields and
+    never contain the same key. A page costs one query per queryset,
+    each fetching at most a page of rows, which are merged in memory.
+    """
+    def __init__(self, querysets, per_page, ordering):
+        super().__init__(querysets[0], per_page, ordering)
+        self.querysets = querysets
+
+    @cached_property
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def page_querysets(self, cursor=None):
+        backwards = False
+        page_querysets = []
+        for queryset in self.querysets:
+            queryset, backwards = self.page_queryset(cursor, queryset)
+            page_querysets.append(queryset)
+        return page_querysets, backwards
+
+    def merge_rows(self, row_lists, backwards=False):
+        """
+        Returns the rows of all querysets in page order, up to one more
+        than a page.
+        """
+        rows = [row for row_list in row_lists for row in row_list]
+        rows.sort(key=self.row_key, reverse=self.descending != backwards)
+        return rows[:self.per_page + 1]
+
+    def page(self, cursor=None):
+        querysets, backwards = self.page_querysets(cursor)
+        rows = self.merge_rows(querysets, backwards)
+        return self.build_page(rows, cursor, backwards)
+
+
+class CursorPaginationMixin:
+    """
+    Replaces ListView's offset pagination with keyset pagination.
+    Views set cursor_ordering to match their queryset ordering and can
+    set paginate_count to show the total number of rows.
+    """
+    cursor_ordering = ('id',)
+    cursor_query_param = 'cursor'
+    paginate_count = False
+
+    def get_cursor_paginator(self, queryset, page_size):
+        return CursorPaginator(queryset, page_size, self.cursor_ordering)
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Returns the paginator, page, object list and pagination flag
+        in the form ListView.get_context_data expects.
+        """
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        cursor = self.request.GET.get(self.cursor_query_param) or None
+        try:
+            page = paginator.page(cursor)
+        except ValueError:
+            raise Http404("Invalid page cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,124 @@
+"""
+Read-replica routing for the event listings and details pages.
+
+When settings.REPLICA_DATABASE names a database alias, the listings and
+anonymous event details pages read event data from it, leaving the
+primary to registrations and other writes. Views opt in with
+ReplicaReadMixin, which sets a context variable for the duration of the
+request; ReplicaRouter sends reads of the events app's models to the
+alias it holds. Everything else, and every write, uses the primary.
+
+A replica lags behind the primary, so visitors who have just written
+something are pinned to the primary for REPLICA_PIN_SECONDS with a
+cookie, and they see their own changes.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.deprecation import MiddlewareMixin
+from .cache import get_listings_generation
+
+PIN_COOKIE = 'read_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+replica_alias = ContextVar('replica_alias', default=None)
+
+
+@contextmanager
+def reading_from(alias):
+    """
+    Sends reads of event data made inside the block to the given alias.
+    """
+    token = replica_alias.set(alias)
+    try:
+        yield
+    finally:
+        replica_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Routes reads of the events app's models to the replica while a view
+    has chosen to read from it. Users and sessions always come from the
+    primary, so a login is never lost to replication lag.
+    """
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'events':
+            return replica_alias.get()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """
+    Pins the visitor's reads to the primary for a while after a request
+    that may have written to the database.
+    """
+    def process_response(self, request, response):
+        if settings.REPLICA_DATABASE and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                secure=request.is_secure(), httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Reads event data from the replica for GET and HEAD requests from
+    visitors who are not pinned to the primary. Views can narrow this
+    down by extending use_replica.
+    """
+    def use_replica(self, request):
+        return bool(
+            settings.REPLICA_DATABASE and
+            request.method in ('GET', 'HEAD') and
+            PIN_COOKIE not in request.COOKIES
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.use_replica(request):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.dispatch_to_replica(request, *args, **kwargs)
+        with reading_from(settings.REPLICA_DATABASE):
+            response = super().dispatch(request, *args, **kwargs)
+            # Template responses are rendered after the view returns;
+            # render them here so queries made by templates are routed
+            # the same way.
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+    async def dispatch_to_replica(self, request, *args, **kwargs):
+        """
+        Does the same for async views. Worker threads started with
+        sync_to_async inherit the context, and with it the replica.
+        """
+        with reading_from(settings.REPLICA_DATABASE):
+            response = await super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                await sync_to_async(response.render)()
+        return response
+
+
+class ListingsReplicaReadMixin(ReplicaReadMixin):
+    """
+    Reads listings from the replica unless a published event changed
+    within the last REPLICA_PIN_SECONDS. Listing pages are cached and
+    validated by the listings generation, so a page read from a replica
+    that has not caught up yet would be kept until the next change.
+    """
+    def use_replica(self, request):
+        if not super().use_replica(request):
+            return False
+        changed = get_listings_generation() / 1e9
+        return time.time() - changed > settings.REPLICA_PIN_SECONDS
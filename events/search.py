@@ -0,0 +1,179 @@
+"""
+Full-text search index for events.
+
+SQLite uses an FTS5 table keyed by the event id and PostgreSQL a table of
+weighted tsvector documents with a GIN index; both are created by the
+events migrations. Titles weigh more than locations, which weigh more
+than descriptions. Other backends fall back to a title filter.
+"""
+import re
+from django.db import connections, router
+from .models import Event
+
+INDEX_TABLE = 'events_event_fts'
+MAX_TERMS = 10
+
+SQLITE_CREATE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} "
+    "USING fts5(title, description, location, "
+    "tokenize='porter unicode61')"
+)
+SQLITE_RANK = f"bm25({INDEX_TABLE}, 10.0, 1.0, 4.0)"
+
+POSTGRESQL_CREATE = (
+    f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+    "event_id bigint PRIMARY KEY "
+    "REFERENCES events_event (id) ON DELETE CASCADE DEFERRABLE "
+    "INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    f"CREATE INDEX IF NOT EXISTS {INDEX_TABLE}_document_idx "
+    f"ON {INDEX_TABLE} USING GIN (document)",
+)
+POSTGRESQL_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce({title}, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({location}, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({description}, '')), 'C')"
+)
+
+
+def create_index(connection):
+    """
+    Creates the search index table for the connection's backend and
+    fills it from the existing events. Used by the migrations.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(SQLITE_CREATE)
+            cursor.execute(
+                f"INSERT INTO {INDEX_TABLE} "
+                "(rowid, title, description, location) "
+                "SELECT id, title, description, location FROM events_event"
+            )
+        elif connection.vendor == 'postgresql':
+            for statement in POSTGRESQL_CREATE:
+                cursor.execute(statement)
+            document = POSTGRESQL_DOCUMENT.format(
+                title='title', location='location', description='description'
+            )
+            cursor.execute(
+                f"INSERT INTO {INDEX_TABLE} (event_id, document) "
+                f"SELECT id, {document} FROM events_event"
+            )
+
+
+def drop_index(connection):
+    """
+    Drops the search index table. Used to reverse the migration.
+    """
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+
+
+def index_events(events, using=None):
+    """
+    Adds or refreshes the search documents of the given saved events.
+    """
+    events = [event for event in events if event.pk is not None]
+    if not events:
+        return
+    connection = connections[using or router.db_for_write(Event)]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            remove_events([event.pk for event in events], connection.alias)
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} "
+                "(rowid, title, description, location) "
+                "VALUES (%s, %s, %s, %s)",
+                [(event.pk, event.title, event.description, event.location)
+                 for event in events],
+            )
+        elif connection.vendor == 'postgresql':
+            document = POSTGRESQL_DOCUMENT.format(
+                title='%s', location='%s', description='%s'
+            )
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} (event_id, document) "
+                f"VALUES (%s, {document}) ON CONFLICT (event_id) "
+                "DO UPDATE SET document = EXCLUDED.document",
+                [(event.pk, event.title, event.location, event.description)
+                 for event in events],
+            )
+
+
+def remove_events(event_ids, using=None):
+    """
+    Removes the search documents of the given event ids. PostgreSQL
+    documents are removed by their foreign key, so only SQLite needs this.
+    """
+    event_ids = list(event_ids)
+    connection = connections[using or router.db_for_write(Event)]
+    if connection.vendor != 'sqlite' or not event_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(event_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {INDEX_TABLE} WHERE rowid IN ({placeholders})",
+            event_ids,
+        )
+
+
+def search_terms(query):
+    """
+    Splits a user's query into at most MAX_TERMS word terms, dropping
+    any operator syntax so it cannot break the index query.
+    """
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def search_event_ids(query, limit, offset=0):
+    """
+    Returns the ids of published events matching every term of the query,
+    best matches first. Each term also matches words it is a prefix of.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    connection = connections[router.db_for_read(Event)]
+    if connection.vendor == 'sqlite':
+        sql = (
+            f"SELECT e.id FROM {INDEX_TABLE} "
+            f"JOIN events_event e ON e.id = {INDEX_TABLE}.rowid "
+            f"WHERE {INDEX_TABLE} MATCH %s AND e.status = 1 "
+            f"ORDER BY {SQLITE_RANK}, e.id LIMIT %s OFFSET %s"
+        )
+        params = [' '.join(f'"{term}"*' for term in terms), limit, offset]
+    elif connection.vendor == 'postgresql':
+        sql = (
+            f"SELECT e.id FROM {INDEX_TABLE} f "
+            "JOIN events_event e ON e.id = f.event_id, "
+            "to_tsquery('english', %s) q "
+            "WHERE f.document @@ q AND e.status = 1 "
+            "ORDER BY ts_rank(f.document, q) DESC, e.id LIMIT %s OFFSET %s"
+        )
+        params = [' & '.join(f'{term}:*' for term in terms), limit, offset]
+    else:
+        queryset = Event.objects.filter(status=1)
+        for term in terms:
+            queryset = queryset.filter(title__icontains=term)
+        return list(
+            queryset.order_by('date', 'id')
+            .values_list('id', flat=True)[offset:offset + limit]
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_events(query, limit, offset=0):
+    """
+    Returns the matching published events in rank order,
+    with their creators joined in.
+    """
+    ids = search_event_ids(query, limit, offset)
+    events = (
+        Event.objects
+        .select_related('created_by')
+        .in_bulk(ids)
+    )
+    return [events[pk] for pk in ids if pk in events]
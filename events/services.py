@@ -0,0 +1,131 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .cache import bump_listings_generation
+from .jobs import enqueue
+from .models import Event, EventRegistration
+from .tasks import sends_mail
+
+
+class RegistrationError(Exception):
+    """
+    Base class for registrations that cannot be completed.
+    """
+
+
+class EventFull(RegistrationError):
+    """
+    Raised when an event has no seats left.
+    """
+    def __init__(self):
+        super().__init__("Sorry, this event is fully booked.")
+
+
+class AlreadyRegistered(RegistrationError):
+    """
+    Raised when the user is already registered for the event.
+    """
+    def __init__(self):
+        super().__init__("You are already registered for this event.")
+
+
+def roster_changed():
+    """
+    Returns the update() arguments that mark an event's roster as changed,
+    so conditional GETs of its details page stop matching.
+    """
+    return {
+        'roster_version': F('roster_version') + 1,
+        'updated_at': timezone.now(),
+    }
+
+
+def invalidate_attendance(event):
+    """
+    Drops cached listing pages showing the event's attendance once the
+    current transaction commits.
+    """
+    if event.status == 1:
+        transaction.on_commit(bump_listings_generation)
+
+
+def register(event, user, note=None):
+    """
+    Registers the user for the event, holding a seat if it has a capacity.
+
+    The seat is taken with a single conditional UPDATE on the event row,
+    which only succeeds while registration_count is below capacity.
+    The row lock it takes is held until the registration is inserted,
+    so concurrent requests for the same event queue up on that one row
+    while other events are unaffected. The confirmation mail, if mail is
+    configured, is queued in the same transaction. Raises EventFull or
+    AlreadyRegistered; in both cases nothing is written.
+    """
+    with transaction.atomic():
+        seats = (
+            Event.objects
+            .filter(pk=event.pk)
+            .filter(
+                Q(capacity__isnull=True) |
+                Q(registration_count__lt=F('capacity'))
+            )
+            .update(
+                registration_count=F('registration_count') + 1,
+                **roster_changed()
+            )
+        )
+        if not seats:
+            raise EventFull()
+        try:
+            with transaction.atomic():
+                registration = EventRegistration.objects.create(
+                    event=event, user=user, note=note
+                )
+        except IntegrityError:
+            # Leaving the outer block with an exception releases the seat.
+            raise AlreadyRegistered()
+        invalidate_attendance(event)
+        if user.email and sends_mail():
+            enqueue(
+                'send_registration_email',
+                event_id=event.pk, user_id=user.pk, registered=True,
+            )
+    return registration
+
+
+def cancel(event, user):
+    """
+    Cancels the user's registration for the event and releases its seat.
+    Returns True if a registration was removed.
+    """
+    with transaction.atomic():
+        deleted, _ = EventRegistration.objects.filter(
+            event=event, user=user
+        ).delete()
+        if deleted:
+            Event.objects.filter(pk=event.pk).update(
+                registration_count=F('registration_count') - deleted,
+                **roster_changed()
+            )
+            invalidate_attendance(event)
+            if user.email and sends_mail():
+                enqueue(
+                    'send_registration_email',
+                    event_id=event.pk, user_id=user.pk, registered=False,
+                )
+    return bool(deleted)
+
+
+def update_note(registration, note):
+    """
+    Changes the note on a registration. Returns True if it changed.
+    """
+    if note == registration.note:
+        return False
+    with transaction.atomic():
+        registration.note = note
+        registration.save(update_fields=['note'])
+        Event.objects.filter(pk=registration.event_id).update(
+            **roster_changed()
+        )
+    return True
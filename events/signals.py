@@ -0,0 +1,103 @@
+from functools import partial
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .cache import (
+    EVENT_VERSION_PREFIX, USER_VERSION_PREFIX, bump_version,
+    bump_listings_generation,
+)
+from .models import Event
+from .search import remove_events
+from .services import roster_changed
+
+NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def name_may_have_changed(created, update_fields):
+    """
+    Returns whether a saved user's name may have changed. Saves limited
+    to other fields, such as the last_login update on every login, are
+    ignored.
+    """
+    if created:
+        return False
+    return update_fields is None or bool(NAME_FIELDS & set(update_fields))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_card(sender, instance, using, **kwargs):
+    """
+    Invalidates the cached card of an event that was saved or deleted,
+    once the change is committed. Bumping the version earlier would let
+    a concurrent request cache the old row under the new version.
+    """
+    transaction.on_commit(
+        partial(bump_version, EVENT_VERSION_PREFIX, instance.pk),
+        using=using,
+    )
+
+
+@receiver(pre_save, sender=Event)
+def note_event_unpublishing(sender, instance, **kwargs):
+    """
+    Records whether a pending event being saved was published before,
+    so unpublishing it also invalidates the cached listings.
+    """
+    instance._was_published = (
+        instance.status != 1 and instance.pk is not None and
+        Event.objects.filter(pk=instance.pk, status=1).exists()
+    )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_listings(sender, instance, using, **kwargs):
+    """
+    Invalidates the cached listing pages when a published event changes,
+    once the change is committed.
+    """
+    if instance.status == 1 or getattr(instance, '_was_published', False):
+        transaction.on_commit(bump_listings_generation, using=using)
+
+
+@receiver(post_delete, sender=Event)
+def remove_search_document(sender, instance, using, **kwargs):
+    """
+    Removes a deleted event from the search index.
+    """
+    remove_events([instance.pk], using=using)
+
+
+@receiver(post_save, sender=User)
+def invalidate_creator_cards(sender, instance, using, created=False,
+                             update_fields=None, **kwargs):
+    """
+    Invalidates the cached cards of a user's events when a field shown
+    on them may have changed.
+    """
+    if not name_may_have_changed(created, update_fields):
+        return
+    transaction.on_commit(
+        partial(bump_version, USER_VERSION_PREFIX, instance.pk), using=using
+    )
+    if instance.created_events.filter(status=1).exists():
+        transaction.on_commit(bump_listings_generation, using=using)
+
+
+@receiver(post_save, sender=User)
+def mark_named_events_changed(sender, instance, created=False,
+                              update_fields=None, **kwargs):
+    """
+    Marks the events whose details pages show a renamed user, as their
+    creator or on the roster, as changed, so conditional GETs of those
+    pages stop matching.
+    """
+    if not name_may_have_changed(created, update_fields):
+        return
+    Event.objects.filter(registrations__user=instance).update(
+        **roster_changed()
+    )
+    instance.created_events.update(updated_at=timezone.now())
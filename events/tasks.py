@@ -0,0 +1,88 @@
+"""
+Background jobs run by the run_worker command.
+"""
+import logging
+from io import BytesIO
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import mail_managers, send_mail
+from PIL import Image
+from .images import get_image_storage, normalize_image
+from .jobs import job
+from .models import ContactMessage, Event, StagedImage
+
+logger = logging.getLogger(__name__)
+
+DUMMY_EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
+
+
+def sends_mail():
+    """
+    Returns whether an email backend is configured. Mail jobs are only
+    queued if so, so that they neither fail against a missing mail
+    server nor pile up unsent.
+    """
+    return settings.EMAIL_BACKEND != DUMMY_EMAIL_BACKEND
+
+
+@job('notify_contact_message')
+def notify_contact_message(message_id):
+    """
+    Forwards a contact form message to the site managers.
+    """
+    message = ContactMessage.objects.filter(pk=message_id).first()
+    if message is None:
+        return
+    mail_managers(
+        f"Contact message from {message.name}",
+        f"{message.name} <{message.email}> wrote:\n\n{message.message}",
+    )
+
+
+@job('send_registration_email')
+def send_registration_email(event_id, user_id, registered):
+    """
+    Confirms a registration or cancellation to the user, if they gave
+    an email address.
+    """
+    user = User.objects.filter(pk=user_id).first()
+    event = Event.objects.filter(pk=event_id).first()
+    if user is None or event is None or not user.email:
+        return
+    if registered:
+        subject = f"You are registered for {event.title}"
+        body = (
+            f"See you at {event.title} on {event.date} at {event.time} "
+            f"in {event.location}."
+        )
+    else:
+        subject = f"Your registration for {event.title} was cancelled"
+        body = f"You are no longer registered for {event.title}."
+    send_mail(subject, body, None, [user.email])
+
+
+@job('process_event_image')
+def process_event_image(event_id, image_id):
+    """
+    Resizes and re-encodes an event's staged upload, stores it and
+    shows it on the event. Files that are not images are dropped and
+    the event keeps the placeholder. If the staged upload is missing
+    or storing fails, the job fails and is retried with the upload kept.
+    """
+    staged = StagedImage.objects.get(pk=image_id)
+    event = Event.objects.filter(pk=event_id).first()
+    if event is not None:
+        try:
+            content = normalize_image(BytesIO(staged.data))
+        except (OSError, Image.DecompressionBombError):
+            content = None
+            logger.warning(
+                "Dropping unreadable image for event %s.", event_id
+            )
+        if content is not None:
+            event.featured_image = get_image_storage().save(content)
+            event.save(update_fields=[
+                'featured_image', 'image_variants', 'is_placeholder',
+                'updated_at',
+            ])
+    staged.delete()
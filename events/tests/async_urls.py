@@ -0,0 +1,14 @@
+"""
+URLconf serving the pages the way eventease.urls does under ASGI.
+"""
+from django.urls import include, path
+from events import async_views
+
+urlpatterns = [
+    path('', async_views.UpcomingEventList.as_view(), name='home'),
+    path('event/<slug:slug>/', async_views.EventDetails.as_view(),
+         name='event_details'),
+    path('past-events/', async_views.PastEventList.as_view(),
+         name='past_events'),
+    path('', include('eventease.urls')),
+]
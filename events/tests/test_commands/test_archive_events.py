@@ -0,0 +1,126 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import date
+from events.models import ArchivedEvent, ArchivedRegistration, Event
+from events.models import EventRegistration
+from events.tests.utils import create_event
+
+
+class TestArchiveEvents(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser')
+        self.attendee = User.objects.create_user(username='attendee')
+
+    def archive(self, **options):
+        out = StringIO()
+        call_command('archive_events', stdout=out, **options)
+        return out.getvalue()
+
+    def past_titles(self, response):
+        return [event.title for event in response.context['past_events']]
+
+    def test_moves_old_events_with_their_registrations(self):
+        old = create_event(self.user, 'Old Event', days=-400)
+        registration = EventRegistration.objects.create(
+            event=old, user=self.attendee, note='See you'
+        )
+        recent = create_event(self.user, 'Recent Event', days=-10)
+        output = self.archive()
+        self.assertIn('Archived 1 event(s) and 1 registration(s)', output)
+
+        self.assertFalse(Event.objects.filter(pk=old.pk).exists())
+        self.assertFalse(EventRegistration.objects.exists())
+        self.assertTrue(Event.objects.filter(pk=recent.pk).exists())
+        archived = ArchivedEvent.objects.get()
+        self.assertEqual(
+            (archived.pk, archived.slug, archived.date, archived.title),
+            (old.pk, old.slug, old.date, old.title)
+        )
+        archived_registration = ArchivedRegistration.objects.get()
+        self.assertEqual(archived_registration.pk, registration.pk)
+        self.assertEqual(archived_registration.event, archived)
+        self.assertEqual(archived_registration.note, 'See you')
+
+    def test_moves_events_in_chunks(self):
+        for index in range(5):
+            create_event(self.user, f'Old Event {index}', days=-30 - index)
+        output = self.archive(days=20, chunk_size=2)
+        self.assertIn('Archived 5 event(s)', output)
+        self.assertEqual(ArchivedEvent.objects.count(), 5)
+        self.assertFalse(Event.objects.exists())
+
+    def test_dry_run_moves_nothing(self):
+        create_event(self.user, 'Old Event', days=-400)
+        output = self.archive(dry_run=True)
+        self.assertIn('Would archive 1 event(s)', output)
+        self.assertEqual(Event.objects.count(), 1)
+        self.assertFalse(ArchivedEvent.objects.exists())
+
+    def test_new_events_do_not_reuse_archived_slugs(self):
+        old = create_event(self.user, 'Reunion', days=-400)
+        self.archive()
+        self.assertNotEqual(create_event(self.user, 'Reunion', days=1).slug,
+                            old.slug)
+
+    def test_past_events_list_both_tiers(self):
+        for days in (-400, -300, -5, -3, -1):
+            create_event(self.user, f'Event {days}', days=days)
+        create_event(self.user, 'Pending', days=-500, status=0)
+        self.archive(days=100)
+        # An event dated before the archived ones that is still live.
+        create_event(self.user, 'Late Entry', days=-350)
+        url = reverse('past_events')
+
+        response = self.client.get(url)
+        self.assertEqual(
+            self.past_titles(response),
+            ['Event -1', 'Event -3', 'Event -5', 'Event -300', 'Late Entry',
+             'Event -400']
+        )
+
+    def test_past_events_paginate_across_tiers(self):
+        for days in range(1, 15):
+            create_event(self.user, f'Event {days}', days=-days * 10)
+        self.archive(days=45)
+        url = reverse('past_events')
+        first = self.client.get(url)
+        second = self.client.get(
+            url, {'cursor': first.context['page_obj'].next_cursor}
+        )
+        self.assertEqual(
+            self.past_titles(second),
+            [f'Event {days}' for days in range(7, 13)]
+        )
+        back = self.client.get(
+            url, {'cursor': second.context['page_obj'].previous_cursor}
+        )
+        self.assertEqual(self.past_titles(back), self.past_titles(first))
+
+    def test_api_lists_archived_events(self):
+        create_event(self.user, 'Archived', days=-400)
+        create_event(self.user, 'Live', days=-1)
+        self.archive()
+        data = self.client.get(reverse('api_past_events')).json()
+        self.assertEqual(
+            [event['title'] for event in data['results']],
+            ['Live', 'Archived']
+        )
+        data = self.client.get(
+            reverse('api_past_events'), {'location': 'Paris'}
+        ).json()
+        self.assertEqual(data['results'], [])
+
+    def test_refuses_cutoffs_in_the_future(self):
+        create_event(self.user, 'Upcoming Event', days=10)
+        for options in ({'days': -1}, {'before': date(2100, 1, 1)}):
+            with self.assertRaises(CommandError):
+                self.archive(**options)
+        self.assertTrue(Event.objects.exists())
+        self.assertFalse(ArchivedEvent.objects.exists())
@@ -0,0 +1,42 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from datetime import timedelta, date, time
+from events.models import Event
+
+
+class TestBenchmarkApi(TestCase):
+
+    def test_reports_each_comparison(self):
+        Event.objects.create(
+            title='Test Event',
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=User.objects.create_user(username='testuser')
+        )
+        out = StringIO()
+        call_command('benchmark_api', requests=2, cold_cache=True, stdout=out)
+        for name in ('Upcoming events', 'Past events', 'Event details',
+                     'Roster'):
+            self.assertIn(name, out.getvalue())
+        self.assertIn('JSON is', out.getvalue())
+
+    def test_requires_published_events(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_api', requests=1, stdout=StringIO())
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379',
+    }})
+    def test_refuses_to_clear_a_shared_cache(self):
+        with self.assertRaisesMessage(CommandError, 'Refusing to clear'):
+            call_command(
+                'benchmark_api', requests=1, cold_cache=True,
+                stdout=StringIO(),
+            )
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from events.benchmarking import run_load
+
+
+class OkHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        status = 200 if self.path == '/ok/' else 500
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRunLoad(SimpleTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), OkHandler)
+        threading.Thread(target=self.server.serve_forever).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.port = self.server.server_address[1]
+
+    def test_reports_throughput_and_latency(self):
+        result = asyncio.run(run_load('127.0.0.1', self.port, '/ok/', 4, 0.3))
+        self.assertGreater(result['requests'], 0)
+        self.assertEqual(result['errors'], 0)
+        self.assertGreater(result['requests_per_second'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+    def test_counts_failed_requests(self):
+        result = asyncio.run(
+            run_load('127.0.0.1', self.port, '/fail/', 2, 0.2)
+        )
+        self.assertEqual(result['requests'], 0)
+        self.assertGreater(result['errors'], 0)
+        self.assertIsNone(result['p99_ms'])
+
+
+class TestBenchmarkServers(TestCase):
+
+    def test_requires_published_events(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_servers', stdout=StringIO())
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+from unittest import mock
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth.models import User
+from events import urls
+from events.models import Event
+
+
+class TestBenchmarkViews(TestCase):
+
+    def setUp(self):
+        # The test database stands in for the throwaway one the command
+        # would create.
+        for name in ('setup_databases', 'teardown_databases'):
+            patcher = mock.patch(
+                f'events.management.commands.benchmark_views.{name}'
+            )
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+        self.teardown_databases.side_effect = self.drop_generated_data
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, 'results.json')
+
+    def drop_generated_data(self, *args):
+        self.seeded_events = Event.objects.count()
+        User.objects.all().delete()
+
+    def benchmark(self, **options):
+        out = StringIO()
+        options = {
+            'users': 10, 'events': 20, 'registrations': 50, **options
+        }
+        call_command('benchmark_views', requests=2, stdout=out, **options)
+        return out.getvalue()
+
+    def test_measures_every_url(self):
+        output = self.benchmark(output=self.output)
+        self.setup_databases.assert_called_once()
+        self.assertEqual(
+            self.setup_databases.call_args.kwargs['aliases'], {'default'}
+        )
+        self.teardown_databases.assert_called_once()
+        self.assertEqual(self.seeded_events, 20)
+        with open(self.output) as results_file:
+            results = json.load(results_file)['views']
+        names = [pattern.name for pattern in urls.urlpatterns]
+        self.assertEqual(sorted(results), sorted(names))
+        for name in names:
+            self.assertIn(f'{name}: p50', output)
+            self.assertGreater(results[name]['memory_bytes'], 0)
+            self.assertIn('queries', results[name])
+
+    def test_compares_with_the_baseline(self):
+        self.benchmark(output=self.output)
+        output = self.benchmark(
+            baseline=self.output, threshold=10000, cold_cache=True
+        )
+        self.assertIn('home: p50_ms', output)
+        self.assertIn('No regressions', output)
+
+    def test_fails_on_regressions(self):
+        self.benchmark(output=self.output)
+        with open(self.output) as results_file:
+            results = json.load(results_file)
+        results['views']['home']['p50_ms'] = 0.001
+        results['views']['about']['queries'] = -1
+        with open(self.output, 'w') as results_file:
+            json.dump(results, results_file)
+        with self.assertRaises(CommandError) as raised:
+            self.benchmark(baseline=self.output, threshold=10000)
+        self.assertIn('home p50_ms', str(raised.exception))
+        self.assertIn('about queries: -1', str(raised.exception))
+
+    def test_requires_published_events(self):
+        with self.assertRaises(CommandError):
+            self.benchmark(events=0, registrations=0)
+        self.teardown_databases.assert_called_once()
+
+    def test_refuses_baselines_of_other_data(self):
+        self.benchmark(output=self.output)
+        with self.assertRaisesMessage(CommandError, 'different data'):
+            self.benchmark(baseline=self.output, seed=2)
+
+    def test_leaves_the_site_cache_alone(self):
+        cache.set('site-key', 'kept')
+        self.benchmark(cold_cache=True)
+        self.assertEqual(cache.get('site-key'), 'kept')
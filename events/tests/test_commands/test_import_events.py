@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth.models import User
+from datetime import timedelta, date
+from events.models import Event
+
+
+class TestImportEvents(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='partner')
+        self.event_date = (date.today() + timedelta(days=7)).isoformat()
+
+    def write_file(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command(
+            'import_events', path, created_by='partner',
+            stdout=out, stderr=err, **options
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_csv_in_chunks_with_unique_slugs(self):
+        rows = ''.join(
+            f"Weekly Meetup,Talks and pizza.,{self.event_date},18:00,Berlin\n"
+            for _ in range(5)
+        )
+        path = self.write_file(
+            '.csv', "title,description,date,time,location\n" + rows
+        )
+        out, err = self.run_import(path, chunk_size=2, approve=True)
+
+        self.assertIn('Imported 5 event(s), rejected 0', out)
+        self.assertIn('rows/s', out)
+        slugs = sorted(Event.objects.values_list('slug', flat=True))
+        self.assertEqual(slugs, [
+            'weekly-meetup', 'weekly-meetup-1', 'weekly-meetup-2',
+            'weekly-meetup-3', 'weekly-meetup-4'
+        ])
+        self.assertFalse(Event.objects.exclude(status=1).exists())
+        self.assertFalse(Event.objects.exclude(created_by=self.user).exists())
+
+    def test_imports_jsonl_and_reports_invalid_rows(self):
+        lines = [
+            json.dumps({
+                'title': 'Book Club', 'description': 'Monthly reading.',
+                'date': self.event_date, 'time': '19:00',
+                'location': 'Hamburg', 'capacity': 20,
+            }),
+            json.dumps({'title': 'No date', 'description': 'x',
+                        'time': '19:00', 'location': 'Hamburg'}),
+            'not json',
+        ]
+        path = self.write_file('.jsonl', '\n'.join(lines) + '\n')
+        out, err = self.run_import(path)
+
+        self.assertIn('Imported 1 event(s), rejected 2', out)
+        self.assertIn('Line 2: date: This field is required.', err)
+        self.assertIn('Line 3: invalid row', err)
+        event = Event.objects.get()
+        self.assertEqual(event.capacity, 20)
+        self.assertEqual(event.status, 0)
+
+    def test_unknown_user_is_an_error(self):
+        path = self.write_file('.csv', "title\n")
+        with self.assertRaises(CommandError):
+            call_command('import_events', path, created_by='nobody')
@@ -0,0 +1,37 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from datetime import timedelta, date, time
+from events.models import Event, EventRegistration
+
+
+class TestReconcileRegistrationCounts(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+        self.event = Event.objects.create(
+            title='Test Event',
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=self.user
+        )
+        EventRegistration.objects.create(event=self.event, user=self.user)
+        Event.objects.filter(pk=self.event.pk).update(registration_count=5)
+
+    def test_fixes_drifted_counts(self):
+        out = StringIO()
+        call_command('reconcile_registration_counts', stdout=out)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
+        self.assertIn('Fixed 1 event(s)', out.getvalue())
+
+    def test_dry_run_leaves_counts_untouched(self):
+        out = StringIO()
+        call_command('reconcile_registration_counts', dry_run=True, stdout=out)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 5)
+        self.assertIn('stored 5, actual 1', out.getvalue())
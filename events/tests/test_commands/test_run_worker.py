@@ -0,0 +1,19 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from events.jobs import enqueue
+from events.models import ContactMessage, Job
+
+
+class TestRunWorker(TestCase):
+
+    def test_once_runs_due_jobs_and_exits(self):
+        for index in range(3):
+            message = ContactMessage.objects.create(
+                name='Name', email='name@example.com', message='Hello'
+            )
+            enqueue('notify_contact_message', message_id=message.pk)
+        out = StringIO()
+        call_command('run_worker', once=True, batch_size=2, stdout=out)
+        self.assertIn('Finished 3 job(s), 0 failed.', out.getvalue())
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,81 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+from django.test import TestCase
+from django.contrib.auth.models import User
+from events.models import ContactMessage, Event, EventRegistration
+
+
+class TestSeedPerfData(TestCase):
+
+    def seed(self, **options):
+        options = {
+            'users': 30, 'events': 60, 'registrations': 400,
+            'messages': 5, 'batch_size': 7, **options,
+        }
+        out = StringIO()
+        call_command('seed_perf_data', stdout=out, **options)
+        return out.getvalue()
+
+    def snapshot(self):
+        return (
+            list(
+                Event.objects.order_by('pk')
+                .values_list('slug', 'date', 'status', 'registration_count')
+            ),
+            list(
+                EventRegistration.objects
+                .order_by('event__slug', 'user__username')
+                .values_list('event__slug', 'user__username')
+            ),
+        )
+
+    def test_creates_the_requested_volumes(self):
+        output = self.seed()
+        self.assertIn('Created 30 user(s), 60 event(s), 400 registration(s)',
+                      output)
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Event.objects.count(), 60)
+        self.assertEqual(EventRegistration.objects.count(), 400)
+        self.assertEqual(ContactMessage.objects.count(), 5)
+
+    def test_registration_counts_match_registrations(self):
+        self.seed()
+        drifted = (
+            Event.objects
+            .annotate(actual=Count('registrations'))
+            .exclude(registration_count=F('actual'))
+        )
+        self.assertFalse(drifted.exists())
+        self.assertFalse(
+            EventRegistration.objects.filter(event__status=0).exists()
+        )
+
+    def test_titles_collide(self):
+        self.seed()
+        titles = Event.objects.values_list('title', flat=True)
+        self.assertLess(len(set(titles)), len(titles))
+        slugs = Event.objects.values_list('slug', flat=True)
+        self.assertEqual(len(set(slugs)), len(slugs))
+
+    def test_same_seed_gives_same_data(self):
+        self.seed(seed=7)
+        first = self.snapshot()
+        User.objects.all().delete()
+        ContactMessage.objects.all().delete()
+        self.seed(seed=7)
+        self.assertEqual(self.snapshot(), first)
+        User.objects.all().delete()
+        self.seed(seed=8)
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_refuses_to_seed_twice(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_rejects_more_registrations_than_fit(self):
+        with self.assertRaises(CommandError):
+            self.seed(users=2, events=3, registrations=10)
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,73 @@
+from unittest import skipUnless
+from django.test import RequestFactory, TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from datetime import timedelta, date, time
+from events.models import Event
+from events.pagination import CursorPaginator, encode_cursor
+from events.views import UpcomingEventList, PastEventList
+
+LISTING_INDEXES = (
+    'event_status_date_time_idx',
+    'event_approved_date_time_idx',
+    'event_approved_location_idx',
+    'event_approved_creator_idx',
+)
+
+
+class TestEventListingIndexes(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser')
+        for offset in range(-20, 20):
+            Event.objects.create(
+                title=f"Event {offset}",
+                description="Indexed event.",
+                date=date.today() + timedelta(days=offset),
+                time=time(10, 0),
+                location="Berlin",
+                status=offset % 2,
+                created_by=user
+            )
+
+    def listing_queries(self):
+        """
+        Yields the first-page and deep-page queries of both listings,
+        unfiltered and filtered by location or creator.
+        """
+        cursor = encode_cursor([date.today(), time(10, 0), 1])
+        for view_class, ordering in (
+            (UpcomingEventList, ('date', 'time', 'id')),
+            (PastEventList, ('-date', '-time', '-id')),
+        ):
+            for params in ({}, {'location': 'berlin'},
+                           {'creator': 'testuser'}):
+                view = view_class()
+                view.setup(RequestFactory().get('/', params))
+                paginator = CursorPaginator(
+                    view.get_queryset(), 6, ordering
+                )
+                yield paginator.page_queryset()[0]
+                yield paginator.page_queryset(cursor)[0]
+
+    def assertUsesListingIndex(self, plan):
+        self.assertTrue(
+            any(name in plan for name in LISTING_INDEXES),
+            f"Listing query does not use a listing index:\n{plan}"
+        )
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite query plans')
+    def test_sqlite_listing_queries_use_index_without_sorting(self):
+        for queryset in self.listing_queries():
+            plan = queryset.explain()
+            self.assertUsesListingIndex(plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL query plans')
+    def test_postgresql_listing_queries_use_index(self):
+        with connection.cursor() as cursor:
+            # The test table is tiny, so rule out the sequential scan the
+            # planner would otherwise prefer for it.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for queryset in self.listing_queries():
+            self.assertUsesListingIndex(queryset.explain())
@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.images import THUMBNAIL_WIDTHS
+from events.models import Event
+
+
+class TestImageVariants(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+
+    def build_event(self, title='Test Event', **fields):
+        return Event(
+            title=title,
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=self.user,
+            **fields
+        )
+
+    def test_placeholder_has_no_variants(self):
+        event = self.build_event()
+        event.save()
+        self.assertTrue(event.is_placeholder)
+        self.assertEqual(event.image_variants, {})
+
+    def test_variants_are_built_on_save(self):
+        event = self.build_event(featured_image='image/upload/v12/party.jpg')
+        event.save()
+        event.refresh_from_db()
+        self.assertFalse(event.is_placeholder)
+        self.assertEqual(
+            sorted(event.image_variants, key=int),
+            [str(width) for width in THUMBNAIL_WIDTHS]
+        )
+        self.assertIn('w_320', event.image_variants['320'])
+        self.assertIn('v12/party.jpg', event.image_variants['320'])
+        self.assertIn('w_640', event.image_src)
+        self.assertEqual(event.image_srcset.count('w, '), 2)
+        self.assertTrue(event.image_srcset.endswith(' 960w'))
+
+    def test_bulk_create_builds_variants(self):
+        event, = Event.objects.bulk_create([
+            self.build_event(featured_image='image/upload/v1/bulk.jpg')
+        ])
+        self.assertFalse(event.is_placeholder)
+        self.assertIn('bulk.jpg', event.image_variants['960'])
+
+    def test_cards_use_the_stored_variants(self):
+        self.build_event(featured_image='image/upload/v1/card.jpg').save()
+        self.build_event(title='No Image').save()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'srcset="', count=1)
+        self.assertContains(response, 'w_320/v1/card.jpg 320w')
+        self.assertContains(response, 'images/default.png')
@@ -0,0 +1,63 @@
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from events.models import Event, generate_unique_slug, generate_unique_slugs
+from events.models import slug_collisions
+from events.tests.utils import create_event
+
+
+class TestSlugGeneration(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+
+    def test_collisions_get_numbered_suffixes(self):
+        slugs = [
+            create_event(self.user, 'Weekly Meetup').slug for _ in range(3)
+        ]
+        self.assertEqual(
+            slugs, ['weekly-meetup', 'weekly-meetup-1', 'weekly-meetup-2']
+        )
+
+    def test_lowest_free_suffix_is_reused(self):
+        for _ in range(3):
+            create_event(self.user, 'Weekly Meetup')
+        Event.objects.filter(slug='weekly-meetup-1').delete()
+        self.assertEqual(
+            generate_unique_slug('Weekly Meetup', Event), 'weekly-meetup-1'
+        )
+
+    def test_single_query_regardless_of_collisions(self):
+        for _ in range(20):
+            create_event(self.user, 'Weekly Meetup')
+        with self.assertNumQueries(1):
+            slug = generate_unique_slug('Weekly Meetup', Event)
+        self.assertEqual(slug, 'weekly-meetup-20')
+
+    def test_batch_allocation_is_unique_and_uses_one_query(self):
+        create_event(self.user, 'Weekly Meetup')
+        create_event(self.user, 'Book Club')
+        titles = ['Weekly Meetup', 'Book Club', 'Weekly Meetup', 'Hackathon']
+        with self.assertNumQueries(1):
+            slugs = generate_unique_slugs(titles, Event)
+        self.assertEqual(slugs, [
+            'weekly-meetup-1', 'book-club-1', 'weekly-meetup-2', 'hackathon'
+        ])
+
+    def test_only_the_slug_and_its_numbered_variants_are_fetched(self):
+        for title in ('A', 'A', 'A Team', 'Apple', 'A 1 Night', 'Event'):
+            create_event(self.user, title)
+        slugs = Event.objects.filter(slug_collisions('a'))
+        self.assertEqual(
+            sorted(slugs.values_list('slug', flat=True)), ['a', 'a-1']
+        )
+        self.assertEqual(generate_unique_slug('A', Event), 'a-2')
+
+    def test_save_retries_when_slug_is_taken_concurrently(self):
+        create_event(self.user, 'Weekly Meetup')
+        with mock.patch(
+            'events.models.generate_unique_slug',
+            side_effect=['weekly-meetup', 'weekly-meetup-1'],
+        ):
+            event = create_event(self.user, 'Weekly Meetup')
+        self.assertEqual(event.slug, 'weekly-meetup-1')
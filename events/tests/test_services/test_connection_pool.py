@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from eventease.db.backends.sqlite3.base import DatabaseWrapper
+from eventease.db.pool import connection_stats
+
+
+class TestConnectionPool(SimpleTestCase):
+    """
+    Each test pools connections to the test database under an alias of
+    its own, so the counts start from zero.
+    """
+
+    def wrapper(self, **settings):
+        settings_dict = {
+            **connection.settings_dict, 'POOL_SIZE': 2, **settings
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias=self.id())
+        if wrapper.pool is not None:
+            self.addCleanup(wrapper.pool.clear)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def stats(self):
+        return connection_stats()[self.id()]
+
+    def test_closed_connection_is_reused(self):
+        first, second = self.wrapper(), self.wrapper()
+        first.ensure_connection()
+        raw = first.connection
+        first.close()
+        second.ensure_connection()
+        self.assertIs(second.connection, raw)
+        self.assertEqual(
+            self.stats(),
+            {'opened': 1, 'reused': 1, 'discarded': 0, 'idle': 0}
+        )
+
+    def test_pooled_connection_works(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        wrapper.close()
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM events_event')
+            self.assertEqual(cursor.fetchone(), (0,))
+
+    def test_broken_connection_is_discarded(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        raw.close()
+        wrapper.ensure_connection()
+        self.assertIsNot(wrapper.connection, raw)
+        self.assertEqual(self.stats()['opened'], 2)
+        self.assertEqual(self.stats()['discarded'], 1)
+
+    def test_pool_keeps_at_most_pool_size_connections(self):
+        wrappers = [self.wrapper() for _ in range(3)]
+        for wrapper in wrappers:
+            wrapper.ensure_connection()
+        for wrapper in wrappers:
+            wrapper.close()
+        self.assertEqual(self.stats()['idle'], 2)
+        self.assertEqual(self.stats()['discarded'], 1)
+
+    def test_old_connection_is_not_reused(self):
+        wrapper = self.wrapper(POOL_MAX_AGE=0)
+        wrapper.ensure_connection()
+        wrapper.close()
+        wrapper.ensure_connection()
+        self.assertEqual(self.stats()['opened'], 2)
+        self.assertEqual(self.stats()['reused'], 0)
+
+    def test_connection_closed_in_transaction_is_not_pooled(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        wrapper.set_autocommit(False)
+        wrapper.close()
+        self.assertEqual(self.stats()['idle'], 0)
+
+    def test_without_pool_size_connections_are_closed(self):
+        wrapper = self.wrapper(POOL_SIZE=0)
+        wrapper.ensure_connection()
+        wrapper.close()
+        wrapper.ensure_connection()
+        self.assertEqual(self.stats()['opened'], 2)
+
+
+class TestConnectionCounting(TestCase):
+
+    def test_kept_connections_are_counted(self):
+        connection.ensure_connection()
+        before = connection_stats()['default']['reused']
+        self.client.get('/about/')
+        self.assertEqual(connection_stats()['default']['reused'], before + 1)
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+from datetime import date, time
+from events import jobs
+from events.jobs import claim_jobs, enqueue, process_batch, retry_delay
+from events.models import Event, Job, JOB_FAILED, JOB_PENDING, JOB_RUNNING
+from events.services import cancel, register
+
+calls = []
+
+
+@jobs.job('test_record')
+def record(value):
+    calls.append(value)
+
+
+@jobs.job('test_fail')
+def fail():
+    raise RuntimeError("Boom")
+
+
+class TestJobQueue(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_runs_due_jobs_in_order_and_deletes_them(self):
+        for value in range(3):
+            enqueue('test_record', value=value)
+        self.assertEqual(process_batch(10), (3, 0))
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_claims_in_batches(self):
+        for value in range(5):
+            enqueue('test_record', value=value)
+        claimed = claim_jobs(2)
+        self.assertEqual(len(claimed), 2)
+        self.assertTrue(all(job.status == JOB_RUNNING for job in claimed))
+        self.assertEqual(claimed[0].attempts, 1)
+        # Claimed jobs are not handed to another worker.
+        self.assertEqual(len(claim_jobs(10)), 3)
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_skips_jobs_that_are_not_due(self):
+        job = enqueue('test_record', value=1)
+        Job.objects.filter(pk=job.pk).update(
+            run_after=timezone.now() + timedelta(minutes=1)
+        )
+        self.assertEqual(process_batch(10), (0, 0))
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = enqueue('test_fail')
+        before = timezone.now()
+        self.assertEqual(process_batch(10), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, JOB_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('Boom', job.last_error)
+        self.assertGreaterEqual(job.run_after, before + retry_delay(1))
+        self.assertEqual(retry_delay(2), 2 * retry_delay(1))
+        self.assertEqual(retry_delay(50), jobs.MAX_RETRY_DELAY)
+
+    def test_job_fails_after_its_last_attempt(self):
+        job = enqueue('test_fail')
+        Job.objects.filter(pk=job.pk).update(attempts=4)
+        process_batch(10)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.attempts, 5)
+        self.assertEqual(process_batch(10), (0, 0))
+
+    def test_abandoned_jobs_are_claimed_again(self):
+        job = enqueue('test_record', value=1)
+        claim_jobs(10)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - jobs.LOCK_TIMEOUT - timedelta(1)
+        )
+        self.assertEqual(process_batch(10), (1, 0))
+        self.assertEqual(calls, [1])
+
+    def test_abandoned_jobs_fail_after_their_last_attempt(self):
+        job = enqueue('test_record', value=1)
+        Job.objects.filter(pk=job.pk).update(
+            status=JOB_RUNNING, attempts=5, lock_token='dead',
+            locked_at=timezone.now() - jobs.LOCK_TIMEOUT - timedelta(1),
+        )
+        self.assertEqual(process_batch(10), (0, 0))
+        self.assertEqual(calls, [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.attempts, 5)
+        self.assertIn('worker stopped', job.last_error)
+
+    def test_unknown_jobs_cannot_be_enqueued(self):
+        with self.assertRaises(ValueError):
+            enqueue('no_such_job')
+
+
+class TestRegistrationEmails(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com'
+        )
+        self.event = Event.objects.create(
+            title='Test Event',
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=self.user
+        )
+
+    def test_registration_and_cancellation_are_confirmed(self):
+        register(self.event, self.user)
+        cancel(self.event, self.user)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(process_batch(10), (2, 0))
+        self.assertEqual(
+            [message.subject for message in mail.outbox],
+            ['You are registered for Test Event',
+             'Your registration for Test Event was cancelled']
+        )
+
+    def test_full_event_queues_nothing(self):
+        self.event.capacity = 0
+        self.event.save()
+        with self.assertRaises(Exception):
+            register(self.event, self.user)
+        self.assertFalse(Job.objects.exists())
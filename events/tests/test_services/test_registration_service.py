@@ -0,0 +1,127 @@
+import threading
+from django.core import mail
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.db import connection
+from events.jobs import process_batch
+from events.models import EventRegistration, Job
+from events.services import register, cancel, EventFull, AlreadyRegistered
+from events.tests.utils import create_event
+
+
+class TestRegistrationService(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'user-{index}')
+            for index in range(3)
+        ]
+        self.event = create_event(self.users[0], capacity=2)
+
+    def test_register_takes_a_seat(self):
+        registration = register(self.event, self.users[0], 'Hi')
+        self.assertEqual(registration.note, 'Hi')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
+
+    def test_register_raises_when_event_is_full(self):
+        register(self.event, self.users[0])
+        register(self.event, self.users[1])
+        with self.assertRaises(EventFull):
+            register(self.event, self.users[2])
+        self.assertEqual(EventRegistration.objects.count(), 2)
+
+    def test_double_registration_releases_the_seat(self):
+        register(self.event, self.users[0])
+        with self.assertRaises(AlreadyRegistered):
+            register(self.event, self.users[0])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
+
+    def test_cancel_releases_the_seat(self):
+        register(self.event, self.users[0])
+        register(self.event, self.users[1])
+        self.assertTrue(cancel(self.event, self.users[0]))
+        self.assertFalse(cancel(self.event, self.users[0]))
+        register(self.event, self.users[2])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 2)
+
+    def test_events_without_capacity_are_unlimited(self):
+        event = create_event(self.users[0])
+        for user in self.users:
+            register(event, user)
+        event.refresh_from_db()
+        self.assertEqual(event.registration_count, 3)
+
+    def test_register_and_cancel_queue_confirmation_mails(self):
+        user = User.objects.create_user(
+            username='mailed', email='mailed@example.com'
+        )
+        register(self.event, user)
+        cancel(self.event, user)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(process_batch(10), (2, 0))
+        self.assertEqual(
+            [message.to for message in mail.outbox],
+            [['mailed@example.com']] * 2,
+        )
+
+    @override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend'
+    )
+    def test_no_mails_are_queued_without_a_mail_backend(self):
+        user = User.objects.create_user(
+            username='mailed', email='mailed@example.com'
+        )
+        register(self.event, user)
+        cancel(self.event, user)
+        register(self.event, self.users[0])
+        self.assertFalse(Job.objects.exists())
+
+
+class TestConcurrentRegistration(TransactionTestCase):
+
+    capacity = 5
+    attendees = 40
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'user-{index}')
+            for index in range(self.attendees)
+        ]
+        self.event = create_event(self.users[0], capacity=self.capacity)
+
+    def test_concurrent_registrations_do_not_oversell(self):
+        barrier = threading.Barrier(self.attendees)
+        outcomes = []
+
+        def attempt(user):
+            barrier.wait()
+            try:
+                register(self.event, user)
+                outcomes.append('registered')
+            except EventFull:
+                outcomes.append('full')
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=attempt, args=(user,))
+            for user in self.users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.event.refresh_from_db()
+        self.assertEqual(outcomes.count('registered'), self.capacity)
+        self.assertEqual(
+            outcomes.count('full'), self.attendees - self.capacity
+        )
+        self.assertEqual(self.event.registration_count, self.capacity)
+        self.assertEqual(
+            EventRegistration.objects.filter(event=self.event).count(),
+            self.capacity
+        )
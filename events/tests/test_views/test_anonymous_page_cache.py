@@ -0,0 +1,105 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.models import Event
+from events.services import register
+
+
+class TestAnonymousPageCache(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass'
+        )
+        self.event = Event.objects.create(
+            title='Cached Event',
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=self.user
+        )
+
+    def test_repeat_anonymous_requests_skip_the_database(self):
+        for name in ('home', 'past_events', 'about'):
+            self.client.get(reverse(name))
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(reverse('home'))
+        response = self.client.get(reverse('home'), {'cursor': 'bad'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_published_event_change_invalidates_pages(self):
+        self.client.get(reverse('home'))
+        self.event.title = 'Renamed Event'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertContains(self.client.get(reverse('home')), 'Renamed Event')
+
+    def test_pages_are_invalidated_after_the_commit(self):
+        self.client.get(reverse('home'))
+        self.event.title = 'Renamed Event'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.event.save()
+            self.assertContains(self.client.get(reverse('home')), 'Cached')
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(reverse('home')), 'Renamed Event')
+
+    def test_bulk_created_events_invalidate_pages_after_the_commit(self):
+        self.client.get(reverse('home'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            Event.objects.bulk_create([Event(
+                title='Imported Event',
+                description='Description',
+                date=date.today() + timedelta(days=2),
+                time=time(10, 0),
+                location='Berlin',
+                status=1,
+                created_by=self.user,
+            )])
+            self.assertNotContains(
+                self.client.get(reverse('home')), 'Imported Event'
+            )
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(reverse('home')), 'Imported Event')
+
+    def test_unpublishing_an_event_invalidates_pages(self):
+        self.client.get(reverse('home'))
+        self.event.status = 0
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertNotContains(
+            self.client.get(reverse('home')), 'Cached Event'
+        )
+
+    def test_registration_invalidates_pages(self):
+        self.client.get(reverse('home'))
+        with self.captureOnCommitCallbacks(execute=True):
+            register(self.event, self.user)
+        self.assertContains(
+            self.client.get(reverse('home')),
+            '<strong>Attendees:</strong> 1'
+        )
+
+    def test_pages_roll_over_at_midnight(self):
+        self.client.get(reverse('home'))
+        tomorrow = date.today() + timedelta(days=1)
+        with mock.patch('events.cache.date') as mock_date:
+            mock_date.today.return_value = tomorrow
+            with self.assertNumQueries(1):
+                self.client.get(reverse('home'))
+
+    def test_logged_in_users_get_a_fresh_page(self):
+        self.client.get(reverse('home'))
+        self.client.login(username='testuser', password='testpass')
+        self.assertContains(self.client.get(reverse('home')), 'Create Event')
@@ -0,0 +1,123 @@
+import base64
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from events.pagination import encode_cursor
+from events.services import register
+from events.tests.utils import create_event
+
+
+class TestEventApi(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', first_name='Test', last_name='User'
+        )
+
+    def get_json(self, url, status=200, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response.json()
+
+    def test_upcoming_events_are_paginated_by_cursor(self):
+        for day in range(1, 26):
+            create_event(self.user, f'Event {day}', days=day)
+        create_event(self.user, 'Pending', status=0)
+        create_event(self.user, 'Past', days=-1)
+        url = reverse('api_upcoming_events')
+        with self.assertNumQueries(1):
+            first = self.get_json(url)
+        self.assertEqual(len(first['results']), 20)
+        self.assertEqual(first['results'][0]['title'], 'Event 1')
+        self.assertEqual(first['results'][0]['created_by'], {
+            'username': 'testuser', 'name': 'Test User'
+        })
+        self.assertIsNone(first['previous'])
+        second = self.get_json(first['next'])
+        self.assertEqual(
+            [event['title'] for event in second['results']],
+            [f'Event {day}' for day in range(21, 26)]
+        )
+        self.assertIsNone(second['next'])
+        previous = self.get_json(second['previous'])
+        self.assertEqual(previous['results'], first['results'])
+
+    def test_past_events_accept_listing_filters(self):
+        create_event(self.user, 'Old Berlin', days=-2)
+        paris = create_event(self.user, 'Old Paris', days=-3, location='Paris')
+        data = self.get_json(reverse('api_past_events'), location='PARIS')
+        self.assertEqual(
+            [event['id'] for event in data['results']], [paris.pk]
+        )
+
+    def test_invalid_filters_are_rejected(self):
+        create_event(self.user, 'Upcoming')
+        for name in ('api_upcoming_events', 'api_past_events'):
+            data = self.get_json(reverse(name), status=400, date_from='bad')
+            self.assertEqual(data['detail'], 'Invalid filters.')
+            self.assertEqual(list(data['errors']), ['date_from'])
+
+    def test_invalid_cursor_is_rejected(self):
+        data = self.get_json(
+            reverse('api_upcoming_events'), status=400, cursor='bogus'
+        )
+        self.assertEqual(data['detail'], 'Invalid page cursor.')
+
+    def test_hand_made_cursors_are_rejected(self):
+        cursors = [
+            base64.urlsafe_b64encode(b'{"k":[{},"a","b"],"b":0}').decode(),
+            encode_cursor(['2024-01-01', '10:00', '9' * 24]),
+        ]
+        for name in ('api_upcoming_events', 'api_past_events'):
+            for cursor in cursors:
+                data = self.get_json(reverse(name), status=400, cursor=cursor)
+                self.assertEqual(data['detail'], 'Invalid page cursor.')
+
+    def test_event_details(self):
+        event = create_event(self.user, 'Details')
+        data = self.get_json(reverse('api_event_details', args=[event.slug]))
+        self.assertEqual(data['slug'], event.slug)
+        self.assertEqual(data['date'], event.date.isoformat())
+        self.assertEqual(data['time'], '10:00:00')
+        self.assertIsNone(data['image'])
+
+    def test_pending_event_is_not_found(self):
+        event = create_event(self.user, 'Pending', status=0)
+        for name in ('api_event_details', 'api_event_registrations'):
+            self.get_json(reverse(name, args=[event.slug]), status=404)
+
+    def test_roster_is_newest_first(self):
+        event = create_event(self.user, 'Roster')
+        for index in range(3):
+            register(event, User.objects.create_user(f'user{index}'))
+        url = reverse('api_event_registrations', args=[event.slug])
+        with self.assertNumQueries(2):
+            data = self.get_json(url)
+        self.assertEqual(
+            [row['username'] for row in data['results']],
+            ['user2', 'user1', 'user0']
+        )
+
+    def test_etag_revalidates_until_the_roster_changes(self):
+        event = create_event(self.user, 'Cached')
+        url = reverse('api_event_details', args=[event.slug])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        register(event, User.objects.create_user('attendee'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['registration_count'], 1)
+
+    def test_listing_etag_costs_no_queries(self):
+        create_event(self.user, 'Listed')
+        url = reverse('api_upcoming_events')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_are_not_allowed(self):
+        response = self.client.post(reverse('api_upcoming_events'))
+        self.assertEqual(response.status_code, 405)
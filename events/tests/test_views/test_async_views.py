@@ -0,0 +1,113 @@
+import threading
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.loaders import run_concurrently
+from events.models import Event, EventRegistration
+from events.services import register
+from events.tests.utils import create_event
+
+
+@override_settings(ROOT_URLCONF='events.tests.async_urls')
+class TestAsyncViews(TransactionTestCase):
+    """
+    The async views load data in worker threads with connections of
+    their own, which only see committed rows.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser', password='password'
+        )
+        self.event = create_event(self.user, 'Async Event')
+        self.url = reverse('event_details', args=[self.event.slug])
+
+    async def test_details_show_the_roster(self):
+        attendee = await User.objects.acreate(username='attendee')
+        await EventRegistration.objects.acreate(
+            event=self.event, user=attendee, note='See you'
+        )
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['event'], self.event)
+        self.assertContains(response, 'See you')
+        self.assertFalse(response.context['already_registered'])
+
+    async def test_unknown_event_is_not_found(self):
+        response = await self.async_client.get(
+            reverse('event_details', args=['missing'])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_registered_user_is_recognised(self):
+        register(self.event, self.user)
+        self.async_client.force_login(self.user)
+
+        async def get():
+            return await self.async_client.get(self.url)
+
+        response = async_to_sync(get)()
+        self.assertTrue(response.context['already_registered'])
+        self.assertEqual(
+            response.context['form'].instance.user_id, self.user.pk
+        )
+
+    async def test_details_answer_conditional_gets(self):
+        response = await self.async_client.get(self.url)
+        response = await self.async_client.get(
+            self.url, headers={'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_registration_runs_in_the_sync_view(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, {'note': 'Hello'})
+        self.assertRedirects(response, self.url)
+        self.assertTrue(
+            EventRegistration.objects.filter(
+                event=self.event, user=self.user, note='Hello'
+            ).exists()
+        )
+
+    async def test_listings_paginate_by_cursor(self):
+        for day in range(2, 9):
+            await Event.objects.acreate(
+                title=f'Event {day}', description='Description',
+                date=date.today() + timedelta(days=day), time=time(10, 0),
+                location='Berlin', status=1, created_by=self.user,
+            )
+        response = await self.async_client.get(reverse('home'))
+        self.assertEqual(len(response.context['events']), 6)
+        page = response.context['page_obj']
+        self.assertTrue(page.has_next())
+        response = await self.async_client.get(
+            reverse('home'), {'cursor': page.next_cursor}
+        )
+        self.assertEqual(
+            [event.title for event in response.context['events']],
+            ['Event 7', 'Event 8']
+        )
+        response = await self.async_client.get(
+            reverse('past_events'), {'cursor': 'bogus'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_listings_use_the_page_cache(self):
+        await self.async_client.get(reverse('home'))
+        await Event.objects.filter(pk=self.event.pk).aupdate(title='Stale')
+        response = await self.async_client.get(reverse('home'))
+        self.assertContains(response, 'Async Event')
+
+    async def test_queries_run_concurrently(self):
+        # Each function waits for the other, so they only both finish
+        # if they run at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+        results = await run_concurrently(
+            lambda: barrier.wait() is not None,
+            lambda: barrier.wait() is not None,
+        )
+        self.assertEqual(results, [True, True])
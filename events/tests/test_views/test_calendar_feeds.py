@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import time
+from events.ical import feed_token, fold_line
+from events.services import cancel, register
+from events.tests.utils import create_event
+
+
+class TestCalendarFeeds(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser')
+        self.url = reverse('calendar_events')
+
+    def get_feed(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Type'], 'text/calendar; charset=utf-8'
+        )
+        if response.streaming:
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def test_lists_upcoming_published_events(self):
+        event = create_event(
+            self.user, 'Party; Music, Food', time=time(18, 30),
+            description='Line one\nLine two', location='Hall 1, Berlin',
+        )
+        create_event(self.user, 'Pending', status=0)
+        create_event(self.user, 'Past', days=-1)
+        body = self.get_feed(self.url)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        start = event.date.strftime('%Y%m%d')
+        self.assertIn(f'DTSTART:{start}T183000Z\r\n', body)
+        self.assertIn(f'DTEND:{start}T193000Z\r\n', body)
+        self.assertIn('SUMMARY:Party\\; Music\\, Food\r\n', body)
+        self.assertIn('DESCRIPTION:Line one\\nLine two\r\n', body)
+        self.assertIn('LOCATION:Hall 1\\, Berlin\r\n', body)
+
+    def test_repeated_polls_are_served_from_cache(self):
+        create_event(self.user, 'Cached')
+        self.get_feed(self.url)
+        with self.assertNumQueries(0):
+            body = self.get_feed(self.url)
+        self.assertIn('SUMMARY:Cached', body)
+
+    def test_etag_revalidation(self):
+        create_event(self.user, 'Cached')
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_invalidate_the_cached_feed(self):
+        event = create_event(self.user, 'Before')
+        self.get_feed(self.url)
+        event.title = 'After'
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        self.assertIn('SUMMARY:After', self.get_feed(self.url))
+
+    def test_registrations_feed(self):
+        registered = create_event(self.user, 'Registered')
+        create_event(self.user, 'Other')
+        url = reverse('calendar_registrations', args=[feed_token(self.user)])
+        with self.captureOnCommitCallbacks(execute=True):
+            register(registered, self.user)
+        body = self.get_feed(url)
+        self.assertIn('SUMMARY:Registered', body)
+        self.assertNotIn('SUMMARY:Other', body)
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel(registered, self.user)
+        self.assertNotIn('SUMMARY:Registered', self.get_feed(url))
+
+    def test_unknown_token_is_not_found(self):
+        url = reverse('calendar_registrations', args=['forged'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_long_lines_are_folded(self):
+        folded = fold_line('DESCRIPTION:' + 'é' * 100)
+        lines = folded.split('\r\n')[:-1]
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+        self.assertEqual(
+            ''.join(line[1:] if index else line
+                    for index, line in enumerate(lines)),
+            'DESCRIPTION:' + 'é' * 100
+        )
@@ -0,0 +1,104 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta, date, time
+from events.models import Event, EventRegistration
+from events.services import register, update_note
+
+
+class TestConditionalGet(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass'
+        )
+        self.event = Event.objects.create(
+            title='Test Event',
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=self.user
+        )
+        self.url = reverse('event_details', kwargs={'slug': self.event.slug})
+
+    def test_details_answers_304_after_loading_only_the_event(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_details_last_modified_for_anonymous_visitors(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_roster_changes_change_the_details_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        register(self.event, self.user, 'Hello')
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 200)
+
+        registration = EventRegistration.objects.get()
+        update_note(registration, 'Changed')
+        third = self.client.get(self.url, HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertContains(third, 'Changed')
+
+    def test_registrant_renames_change_the_details_etag(self):
+        attendee = User.objects.create_user(
+            username='attendee', first_name='Ann'
+        )
+        register(self.event, attendee)
+        etag = self.client.get(self.url)['ETag']
+        attendee.first_name = 'Anne'
+        attendee.save(update_fields=['first_name'])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_creator_renames_change_the_last_modified_date(self):
+        Event.objects.filter(pk=self.event.pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        last_modified = self.client.get(self.url)['Last-Modified']
+        self.user.last_name = 'Renamed'
+        self.user.save()
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_logins_keep_the_details_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.user.save(update_fields=['last_login'])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_details_etag_differs_per_viewer(self):
+        anonymous_etag = self.client.get(self.url)['ETag']
+        self.client.login(username='testuser', password='testpass')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_listings_answer_304_without_queries(self):
+        for name in ('home', 'past_events'):
+            etag = self.client.get(reverse(name))['ETag']
+            with self.assertNumQueries(0):
+                response = self.client.get(
+                    reverse(name), HTTP_IF_NONE_MATCH=etag
+                )
+            self.assertEqual(response.status_code, 304)
+
+    def test_event_changes_change_the_listing_etag(self):
+        etag = self.client.get(reverse('home'))['ETag']
+        self.event.title = 'Renamed Event'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        response = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed Event')
@@ -1,6 +1,8 @@
-from django.test import TestCase
+from django.core import mail
+from django.test import TestCase, override_settings
 from django.urls import reverse
-from events.models import ContactMessage
+from events.jobs import process_batch
+from events.models import ContactMessage, Job
 from events.forms import ContactForm
 
 
@@ -25,6 +27,32 @@ class TestContactView(TestCase):
         self.assertEqual(msg.email, 'mark@example.com')
         self.assertEqual(msg.message, 'I would like to know more.')
 
+    @override_settings(MANAGERS=[('Staff', 'staff@example.com')])
+    def test_post_queues_the_manager_notification(self):
+        form_data = {
+            'name': 'Mark Selby',
+            'email': 'mark@example.com',
+            'message': 'I would like to know more.'
+        }
+        self.client.post(reverse('contactus'), form_data)
+        self.assertEqual(len(mail.outbox), 0)
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'notify_contact_message')
+        self.assertEqual(process_batch(10), (1, 0))
+        self.assertEqual(mail.outbox[0].to, ['staff@example.com'])
+        self.assertIn('I would like to know more.', mail.outbox[0].body)
+
+    @override_settings(MANAGERS=[])
+    def test_post_without_managers_queues_nothing(self):
+        form_data = {
+            'name': 'Mark Selby',
+            'email': 'mark@example.com',
+            'message': 'I would like to know more.'
+        }
+        self.client.post(reverse('contactus'), form_data)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertFalse(Job.objects.exists())
+
     def test_post_invalid_contact_form_shows_errors(self):
         form_data = {
             'name': '',
@@ -0,0 +1,74 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.models import Event
+
+
+class TestEventCardCache(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', first_name='Jane', last_name='Doe'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event = Event.objects.create(
+                title='Cached Event',
+                description='Description',
+                date=date.today() + timedelta(days=1),
+                time=time(10, 0),
+                location='Berlin',
+                status=1,
+                created_by=self.user
+            )
+        # Logged-in requests bypass the anonymous page cache.
+        self.client.force_login(self.user)
+
+    def test_card_is_served_from_cache(self):
+        self.client.get(reverse('home'))
+        # Change the row behind the cache's back; the card must not change.
+        Event.objects.filter(pk=self.event.pk).update(title='Sneaky Title')
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Cached Event')
+        self.assertNotContains(response, 'Sneaky Title')
+
+    def test_saving_the_event_invalidates_its_card(self):
+        self.client.get(reverse('home'))
+        self.event.title = 'Renamed Event'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Renamed Event')
+
+    def test_renaming_the_creator_invalidates_their_cards(self):
+        self.client.get(reverse('home'))
+        self.user.first_name = 'Janet'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=['first_name'])
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Janet Doe')
+
+    def test_card_is_invalidated_after_the_commit(self):
+        self.client.get(reverse('home'))
+        self.event.title = 'Renamed Event'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.event.save()
+            response = self.client.get(reverse('home'))
+            self.assertContains(response, 'Cached Event')
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(reverse('home')), 'Renamed Event')
+
+    def test_unrelated_user_updates_keep_the_card_cached(self):
+        self.client.get(reverse('home'))
+        version_key = f'user-version:{self.user.pk}'
+        version = cache.get(version_key)
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(cache.get(version_key), version)
+
+    def test_attendance_change_refreshes_the_card(self):
+        self.client.get(reverse('home'))
+        Event.objects.filter(pk=self.event.pk).update(registration_count=7)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, '<strong>Attendees:</strong> 7')
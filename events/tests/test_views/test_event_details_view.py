@@ -38,6 +38,8 @@ class TestEventDetailsView(TestCase):
         reg = EventRegistration.objects.first()
         self.assertEqual(reg.note, 'I am in!')
         self.assertEqual(reg.user, self.user)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
 
     def test_post_update_registration(self):
         EventRegistration.objects.create(
@@ -52,6 +54,7 @@ class TestEventDetailsView(TestCase):
 
     def test_post_cancel_registration(self):
         EventRegistration.objects.create(event=self.event, user=self.user)
+        Event.objects.filter(pk=self.event.pk).update(registration_count=1)
         self.client.login(username='testuser', password='testpass')
         data = {'cancel_registration': '1'}
         response = self.client.post(self.url, data)
@@ -59,3 +62,59 @@ class TestEventDetailsView(TestCase):
         self.assertFalse(EventRegistration.objects.filter(
             event=self.event, user=self.user
         ).exists())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 0)
+
+    def add_registrations(self, count):
+        for index in range(count):
+            user = User.objects.create_user(
+                username=f'attendee-{index}-{User.objects.count()}',
+                first_name='Jane', last_name='Doe'
+            )
+            EventRegistration.objects.create(event=self.event, user=user)
+
+    def test_anonymous_query_budget_does_not_grow_with_registrations(self):
+        for count in (1, 10):
+            self.add_registrations(count)
+            with self.assertNumQueries(2):
+                response = self.client.get(self.url)
+            self.assertContains(response, 'Jane Doe')
+
+    def test_registered_user_query_budget_does_not_grow_with_registrations(
+        self
+    ):
+        EventRegistration.objects.create(event=self.event, user=self.user)
+        self.client.login(username='testuser', password='testpass')
+        for count in (1, 10):
+            self.add_registrations(count)
+            with self.assertNumQueries(4):
+                response = self.client.get(self.url)
+            self.assertContains(response, '(You)')
+
+    def test_invalid_registration_rerenders_with_loaded_roster(self):
+        self.add_registrations(3)
+        self.client.login(username='testuser', password='testpass')
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, {'note': 'x' * 300})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['already_registered'])
+        self.assertEqual(len(response.context['registrations']), 3)
+        self.assertIn('note', response.context['form'].errors)
+
+    def test_post_registration_for_full_event_shows_error(self):
+        Event.objects.filter(pk=self.event.pk).update(
+            capacity=1, registration_count=1
+        )
+        self.client.login(username='testuser', password='testpass')
+        response = self.client.post(self.url, {'note': 'Me too'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'fully booked')
+        self.assertEqual(EventRegistration.objects.count(), 0)
+
+    def test_double_submit_redirects_without_error(self):
+        self.client.login(username='testuser', password='testpass')
+        self.client.post(self.url, {'note': 'First'})
+        response = self.client.post(self.url, {'note': 'Second'})
+        self.assertRedirects(response, self.url)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registration_count, 1)
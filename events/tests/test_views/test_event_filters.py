@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.models import Event
+from events.tests.utils import create_event
+
+
+class TestEventFilters(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice')
+        self.bob = User.objects.create_user(username='bob')
+        self.url = reverse('home')
+
+    def listed(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['object_list'])
+
+    def test_location_matches_ignore_case_and_spacing(self):
+        berlin = create_event(
+            self.alice, 'Berlin Meetup', location='  Berlin  Mitte'
+        )
+        create_event(self.alice, 'Hamburg Meetup', location='Hamburg')
+        self.assertEqual(berlin.location_normalized, 'berlin mitte')
+        self.assertEqual(self.listed(location='BERLIN mitte'), [berlin])
+
+    def test_date_range(self):
+        create_event(self.alice, 'Tomorrow', days=1)
+        week = create_event(self.alice, 'Next Week', days=7)
+        create_event(self.alice, 'Next Month', days=30)
+        self.assertEqual(
+            self.listed(
+                date_from=(date.today() + timedelta(days=5)).isoformat(),
+                date_to=(date.today() + timedelta(days=10)).isoformat(),
+            ),
+            [week]
+        )
+
+    def test_creator(self):
+        create_event(self.alice, 'By Alice')
+        by_bob = create_event(self.bob, 'By Bob')
+        self.assertEqual(self.listed(creator='bob'), [by_bob])
+
+    def test_past_events_are_filtered(self):
+        old = create_event(self.alice, 'Old', days=-3, location='Paris')
+        create_event(self.alice, 'Older', days=-5, location='Rome')
+        self.assertEqual(
+            self.listed(reverse('past_events'), location='paris'), [old]
+        )
+
+    def test_invalid_filters_are_ignored(self):
+        event = create_event(self.alice, 'Any')
+        self.assertEqual(self.listed(date_from='not-a-date'), [event])
+
+    def test_pagination_links_keep_filters(self):
+        for day in range(1, 9):
+            create_event(self.alice, f'Event {day}', days=day)
+        response = self.client.get(self.url, {'creator': 'alice'})
+        next_cursor = response.context['page_obj'].next_cursor
+        self.assertContains(
+            response, f'?creator=alice&amp;cursor={next_cursor}'
+        )
+        response = self.client.get(
+            self.url, {'creator': 'alice', 'cursor': next_cursor}
+        )
+        self.assertEqual(len(response.context['object_list']), 2)
+
+    def test_bulk_create_normalizes_locations(self):
+        event, = Event.objects.bulk_create([Event(
+            title='Bulk', description='Description',
+            date=date.today() + timedelta(days=1), time=time(10, 0),
+            location='New  York', status=1, created_by=self.alice,
+        )])
+        self.assertEqual(event.location_normalized, 'new york')
+        self.assertEqual(self.listed(location='new york'), [event])
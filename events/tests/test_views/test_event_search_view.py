@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import date, time
+from events.models import Event
+from events.tests.utils import create_event
+
+
+class TestEventSearchView(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+        self.url = reverse('event_search')
+
+    def search(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_description = create_event(
+            self.user, 'Book Club',
+            description='We also talk about gardening.',
+        )
+        in_title = create_event(self.user, 'Gardening Workshop')
+        events = self.search('gardening').context['events']
+        self.assertEqual(events, [in_title, in_description])
+
+    def test_matches_location_prefixes_and_all_terms(self):
+        hamburg = create_event(self.user, 'Meetup', location='Hamburg Harbour')
+        create_event(self.user, 'Meetup', location='Berlin')
+        self.assertEqual(
+            self.search('meet hamb').context['events'], [hamburg]
+        )
+
+    def test_only_published_events_are_found(self):
+        create_event(self.user, 'Secret Gardening', status=0)
+        self.assertEqual(self.search('gardening').context['events'], [])
+
+    def test_index_follows_updates_and_deletes(self):
+        event = create_event(self.user, 'Chess Night')
+        event.title = 'Poker Night'
+        event.save()
+        self.assertEqual(self.search('chess').context['events'], [])
+        self.assertEqual(self.search('poker').context['events'], [event])
+        event.delete()
+        self.assertEqual(self.search('poker').context['events'], [])
+
+    def test_bulk_created_events_are_indexed(self):
+        Event.objects.bulk_create([
+            Event(
+                title='Imported Hackathon', description='Description',
+                date=date.today(), time=time(9, 0), location='Berlin',
+                status=1, created_by=self.user
+            )
+        ])
+        self.assertEqual(len(self.search('hackathon').context['events']), 1)
+
+    def test_results_are_paginated(self):
+        for index in range(8):
+            create_event(self.user, f'Running Club {index}')
+        first = self.search('running')
+        self.assertEqual(len(first.context['events']), 6)
+        self.assertTrue(first.context['has_next'])
+        second = self.search('running', page=2)
+        self.assertEqual(len(second.context['events']), 2)
+        self.assertFalse(second.context['has_next'])
+        self.assertFalse(
+            set(first.context['events']) & set(second.context['events'])
+        )
+
+    def test_query_syntax_is_not_passed_to_the_index(self):
+        create_event(self.user, 'Quoted Event')
+        response = self.search('"quoted* (event')
+        self.assertEqual(len(response.context['events']), 1)
+
+    def test_invalid_page_returns_404(self):
+        response = self.client.get(self.url, {'q': 'x', 'page': 'abc'})
+        self.assertEqual(response.status_code, 404)
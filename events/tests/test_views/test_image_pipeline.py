@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from django.test import Client, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from datetime import timedelta, date
+from PIL import Image
+from events.jobs import process_batch
+from events.models import Event, Job, JOB_FAILED, StagedImage
+from events.uploads import SizeLimitedUploadHandler
+
+
+class TestImagePipeline(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass'
+        )
+        self.client.force_login(self.user)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings = override_settings(
+            EVENT_IMAGE_STORAGE='events.images.LocalImageStorage',
+            MEDIA_ROOT=os.path.join(self.directory, 'media'),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get_image_file(self, size=(2400, 1200), mode='RGBA'):
+        data = BytesIO()
+        Image.new(mode, size, 'red').save(data, 'PNG')
+        return SimpleUploadedFile(
+            'party.png', data.getvalue(), content_type='image/png'
+        )
+
+    def post_event(self, image):
+        return self.client.post(reverse('event_create'), {
+            'title': 'Party',
+            'description': 'With an image.',
+            'date': date.today() + timedelta(days=1),
+            'time': '18:00',
+            'location': 'Berlin',
+            'featured_image': image,
+        })
+
+    def test_image_is_processed_after_the_request(self):
+        response = self.post_event(self.get_image_file())
+        self.assertEqual(response.status_code, 302)
+        event = Event.objects.get(title='Party')
+        self.assertTrue(event.is_placeholder)
+        job = Job.objects.get(name='process_event_image')
+        self.assertEqual(job.payload['event_id'], event.pk)
+        staged = StagedImage.objects.get(pk=job.payload['image_id'])
+        self.assertEqual(bytes(staged.data)[:8], b'\x89PNG\r\n\x1a\n')
+
+        self.assertEqual(process_batch(10), (1, 0))
+        event.refresh_from_db()
+        self.assertFalse(event.is_placeholder)
+        self.assertTrue(event.image_src.startswith('/media/event-images/'))
+        self.assertTrue(event.image_src.endswith('.jpg'))
+        self.assertFalse(StagedImage.objects.exists())
+
+        stored = os.path.join(
+            self.directory, 'media', 'event-images',
+            os.path.basename(event.image_src),
+        )
+        with Image.open(stored) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.mode, 'RGB')
+            self.assertEqual(image.size, (1920, 960))
+
+    def test_processing_keeps_registration_count(self):
+        self.post_event(self.get_image_file())
+        Event.objects.update(registration_count=3)
+        process_batch(10)
+        self.assertEqual(Event.objects.get().registration_count, 3)
+
+    def test_invalid_image_keeps_placeholder(self):
+        image = SimpleUploadedFile(
+            'fake.jpg', b'GIF89a not really', content_type='image/jpeg'
+        )
+        self.post_event(image)
+        with self.assertLogs('events.tasks', 'WARNING'):
+            self.assertEqual(process_batch(10), (1, 0))
+        self.assertTrue(Event.objects.get().is_placeholder)
+        self.assertFalse(StagedImage.objects.exists())
+
+    def test_missing_upload_fails_the_job(self):
+        self.post_event(self.get_image_file())
+        job = Job.objects.get()
+        StagedImage.objects.all().delete()
+        Job.objects.update(max_attempts=1)
+        self.assertEqual(process_batch(10), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertIn('StagedImage.DoesNotExist', job.last_error)
+        self.assertTrue(Event.objects.get().is_placeholder)
+
+    def test_deleted_event_drops_staged_image(self):
+        self.post_event(self.get_image_file())
+        Event.objects.all().delete()
+        self.assertEqual(process_batch(10), (1, 0))
+        self.assertFalse(StagedImage.objects.exists())
+
+    @override_settings(MAX_UPLOAD_SIZE=1024 * 1024)
+    def test_oversized_upload_is_rejected(self):
+        image = SimpleUploadedFile(
+            'big.jpg', b'\xff' * (1024 * 1024 + 1),
+            content_type='image/jpeg',
+        )
+        response = self.post_event(image)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, 'The image file is too large (&gt;1MB).'
+        )
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(StagedImage.objects.exists())
+        self.assertIsInstance(
+            response.wsgi_request.upload_handlers[0],
+            SizeLimitedUploadHandler,
+        )
+
+    def test_create_view_still_checks_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = client.post(reverse('event_create'), {'title': 'Party'})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,13 @@
+from django.test import TestCase
+from django.urls import reverse
+from events.forms import CustomLoginForm
+
+
+class TestLoginView(TestCase):
+
+    def test_get_login_page_renders_form(self):
+        response = self.client.get(reverse('login'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'account/login.html')
+        self.assertIsInstance(response.context['form'], CustomLoginForm)
+        self.assertContains(response, f'action="{reverse("account_login")}"')
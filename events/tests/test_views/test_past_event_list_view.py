@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.urls import reverse
@@ -8,6 +9,7 @@ from events.models import Event
 class TestPastEventListView(TestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username='testuser', password='testpass'
         )
@@ -67,3 +69,54 @@ class TestPastEventListView(TestCase):
             events, key=lambda e: (e.date, e.time), reverse=True
             )
         self.assertEqual(events, sorted_events)
+
+    def test_cursor_pages_walk_all_events_most_recent_first(self):
+        for day in range(2, 12):
+            Event.objects.create(
+                title=f"Past Event {day}",
+                description="Paginated event.",
+                date=date.today() - timedelta(days=day),
+                time=time(12, 0),
+                location="Berlin",
+                status=1,
+                created_by=self.user
+            )
+        expected = list(
+            Event.objects
+            .filter(status=1, date__lt=date.today())
+            .order_by('-date', '-time', '-id')
+        )
+
+        seen = []
+        url = reverse('past_events')
+        response = self.client.get(url)
+        while True:
+            seen.extend(response.context['past_events'])
+            page = response.context['page_obj']
+            if not page.has_next():
+                break
+            response = self.client.get(url, {'cursor': page.next_cursor})
+        self.assertEqual(seen, expected)
+        self.assertContains(response, 'btn-previous')
+
+    def test_query_budget_does_not_grow_with_events(self):
+        for count in (1, 6):
+            for index in range(count):
+                creator = User.objects.create_user(
+                    username=f'creator-{count}-{index}',
+                    first_name='Jane', last_name='Doe'
+                )
+                with self.captureOnCommitCallbacks(execute=True):
+                    Event.objects.create(
+                        title=f"Past Event {count}-{index}",
+                        description="Budgeted event.",
+                        date=date.today() - timedelta(days=3),
+                        time=time(10, 0),
+                        location="Berlin",
+                        status=1,
+                        created_by=creator
+                    )
+            # One query for the live events and one for the archive.
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('past_events'))
+            self.assertContains(response, 'Jane Doe')
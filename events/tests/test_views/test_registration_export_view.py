@@ -0,0 +1,67 @@
+import json
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.models import Event, EventRegistration
+
+
+class TestRegistrationExportView(TestCase):
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username='organizer', password='testpass'
+        )
+        self.event = Event.objects.create(
+            title='Test Event',
+            description='Description',
+            date=date.today() + timedelta(days=1),
+            time=time(10, 0),
+            location='Berlin',
+            status=1,
+            created_by=self.organizer
+        )
+        for index in range(3):
+            user = User.objects.create_user(
+                username=f'attendee{index}', password='testpass',
+                first_name='Jane', email=f'jane{index}@example.com'
+            )
+            EventRegistration.objects.create(
+                event=self.event, user=user, note=f'Note, {index}'
+            )
+        self.url = reverse(
+            'registration_export', kwargs={'slug': self.event.slug}
+        )
+
+    def test_organizer_streams_csv(self):
+        self.client.login(username='organizer', password='testpass')
+        response = self.client.get(self.url)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0], 'username,first_name,last_name,email,note,registered_at'
+        )
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(
+            lines[1].startswith('attendee0,Jane,,jane0@example.com,"Note, 0"')
+        )
+
+    def test_organizer_streams_jsonl(self):
+        self.client.login(username='organizer', password='testpass')
+        response = self.client.get(self.url, {'format': 'jsonl'})
+        records = [
+            json.loads(line) for line in
+            b''.join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(
+            [record['username'] for record in records],
+            ['attendee0', 'attendee1', 'attendee2']
+        )
+
+    def test_other_users_are_forbidden(self):
+        self.client.login(username='attendee0', password='testpass')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -0,0 +1,115 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from datetime import timedelta, date, time
+from events.cache import LISTINGS_GENERATION_KEY
+from events.models import Event
+from events.replicas import PIN_COOKIE
+
+
+class ReplicaDataMixin:
+    """
+    Creates different events on the primary and on the replica, so a
+    page shows which database it was read from.
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        for alias in ('default', 'replica'):
+            user = User.objects.db_manager(alias).create_user(
+                username='testuser', password='password'
+            )
+            for days, tense in ((1, 'Upcoming'), (-1, 'Past')):
+                Event(
+                    title=f'{alias.title()} {tense}',
+                    description='Description',
+                    date=date.today() + timedelta(days=days),
+                    time=time(10, 0),
+                    location='Berlin',
+                    status=1,
+                    created_by=user,
+                ).save(using=alias)
+        # The listings last changed long enough ago for the replica.
+        cache.set(LISTINGS_GENERATION_KEY, 1, None)
+
+
+@override_settings(REPLICA_DATABASE='replica', REPLICA_PIN_SECONDS=10)
+class TestReplicaReads(ReplicaDataMixin, TestCase):
+
+    def test_listings_read_from_replica(self):
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Replica Upcoming')
+        self.assertNotContains(response, 'Default Upcoming')
+        response = self.client.get(reverse('past_events'))
+        self.assertContains(response, 'Replica Past')
+
+    def test_logged_in_listings_read_from_replica(self):
+        self.client.login(username='testuser', password='password')
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Replica Upcoming')
+
+    def test_anonymous_details_read_from_replica(self):
+        slug = Event.objects.using('replica').get(
+            title='Replica Upcoming'
+        ).slug
+        response = self.client.get(reverse('event_details', args=[slug]))
+        self.assertContains(response, 'Replica Upcoming')
+
+    def test_logged_in_details_read_from_primary(self):
+        slug = Event.objects.get(title='Default Upcoming').slug
+        self.client.login(username='testuser', password='password')
+        response = self.client.get(reverse('event_details', args=[slug]))
+        self.assertContains(response, 'Default Upcoming')
+
+    def test_writes_pin_reads_to_primary(self):
+        response = self.client.post(reverse('contactus'), {})
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 10)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Default Upcoming')
+        self.assertNotContains(response, 'Replica Upcoming')
+
+    def test_recent_listings_change_reads_from_primary(self):
+        cache.delete(LISTINGS_GENERATION_KEY)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Default Upcoming')
+
+
+class TestWithoutReplica(ReplicaDataMixin, TestCase):
+
+    def test_everything_reads_from_primary(self):
+        response = self.client.post(reverse('contactus'), {})
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Default Upcoming')
+
+
+@override_settings(
+    ROOT_URLCONF='events.tests.async_urls', REPLICA_DATABASE='replica'
+)
+class TestAsyncReplicaReads(ReplicaDataMixin, TransactionTestCase):
+    """
+    The async views load data in worker threads, which inherit the
+    replica from the request's context.
+    """
+
+    def test_details_read_from_replica(self):
+        slug = Event.objects.using('replica').get(
+            title='Replica Upcoming'
+        ).slug
+
+        async def get():
+            return await self.async_client.get(
+                reverse('event_details', args=[slug])
+            )
+
+        self.assertContains(async_to_sync(get)(), 'Replica Upcoming')
+
+    def test_listings_read_from_replica(self):
+
+        async def get():
+            return await self.async_client.get(reverse('home'))
+
+        self.assertContains(async_to_sync(get)(), 'Replica Upcoming')
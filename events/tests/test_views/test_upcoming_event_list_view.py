@@ -1,13 +1,19 @@
+import base64
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from datetime import timedelta, date, time
 from events.models import Event
+from events.pagination import encode_cursor
 
 
 class TestUpcomingEventListView(TestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username='testuser', password='testpass'
         )
@@ -66,3 +72,77 @@ class TestUpcomingEventListView(TestCase):
         events = list(response.context['events'])
         sorted_list = sorted(events, key=lambda e: (e.date, e.time))
         self.assertEqual(events, sorted_list)
+
+    def test_cursor_pages_walk_all_events_in_order(self):
+        for hour in range(8, 18):
+            Event.objects.create(
+                title=f"Event at {hour}",
+                description="Paginated event.",
+                date=self.approved_future_event.date,
+                time=time(hour, 30),
+                location="Berlin",
+                status=1,
+                created_by=self.user
+            )
+        expected = list(
+            Event.objects
+            .filter(status=1, date__gte=date.today())
+            .order_by('date', 'time', 'id')
+        )
+
+        seen = []
+        url = reverse('home')
+        response = self.client.get(url)
+        while True:
+            seen.extend(response.context['events'])
+            page = response.context['page_obj']
+            if not page.has_next():
+                break
+            response = self.client.get(url, {'cursor': page.next_cursor})
+        self.assertEqual(seen, expected)
+
+        previous = response.context['page_obj'].previous_cursor
+        response = self.client.get(url, {'cursor': previous})
+        self.assertEqual(list(response.context['events']), expected[:6])
+
+    def test_pages_do_not_run_a_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('home'))
+        self.assertFalse(
+            any('COUNT(' in query['sql'] for query in queries.captured_queries)
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('home'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_hand_made_cursors_return_404(self):
+        cursors = [
+            base64.urlsafe_b64encode(b'{"k":[{},"a","b"],"b":0}').decode(),
+            encode_cursor(['2024-01-01', '10:00', '9' * 24]),
+        ]
+        for name in ('home', 'past_events'):
+            for cursor in cursors:
+                response = self.client.get(reverse(name), {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+    def test_query_budget_does_not_grow_with_events(self):
+        for count in (1, 6):
+            for index in range(count):
+                creator = User.objects.create_user(
+                    username=f'creator-{count}-{index}',
+                    first_name='Jane', last_name='Doe'
+                )
+                with self.captureOnCommitCallbacks(execute=True):
+                    Event.objects.create(
+                        title=f"Event {count}-{index}",
+                        description="Budgeted event.",
+                        date=date.today() + timedelta(days=3),
+                        time=time(10, 0),
+                        location="Berlin",
+                        status=1,
+                        created_by=creator
+                    )
+            with self.assertNumQueries(1):
+                response = self.client.get(reverse('home'))
+            self.assertContains(response, 'Jane Doe')
@@ -0,0 +1,23 @@
+"""
+Helpers shared by the test modules.
+"""
+from datetime import date, time, timedelta
+from events.models import Event
+
+
+def create_event(user, title='Test Event', days=1, **fields):
+    """
+    Creates a published event by the user, the given number of days
+    from today at 10:00 in Berlin. Keyword arguments override any other
+    field, such as status or location.
+    """
+    return Event.objects.create(**{
+        'title': title,
+        'description': 'Description',
+        'date': date.today() + timedelta(days=days),
+        'time': time(10, 0),
+        'location': 'Berlin',
+        'status': 1,
+        'created_by': user,
+        **fields,
+    })
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class SizeLimitedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Writes each uploaded file straight to a temporary file and stops
+    writing once it passes MAX_UPLOAD_SIZE, so an oversized upload never
+    fills memory or disk. The rest of the file is read and discarded.
+    The file still reports its full size, which lets form validation
+    reject it with the usual message.
+    """
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received <= settings.MAX_UPLOAD_SIZE:
+            self.file.write(raw_data)
@@ -1,14 +1,35 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, ical, views
+
+# Under ASGI the listings and event details run as native async views.
+page_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('', views.UpcomingEventList.as_view(), name='home'),
+    path('', page_views.UpcomingEventList.as_view(), name='home'),
     path('about/', views.AboutView.as_view(), name='about'),
+    path('api/events/', api.ApiUpcomingEventList.as_view(),
+         name='api_upcoming_events'),
+    path('api/past-events/', api.ApiPastEventList.as_view(),
+         name='api_past_events'),
+    path('api/event/<slug:slug>/', api.ApiEventDetails.as_view(),
+         name='api_event_details'),
+    path('api/event/<slug:slug>/registrations/',
+         api.ApiEventRegistrations.as_view(),
+         name='api_event_registrations'),
+    path('calendar/events.ics', ical.UpcomingEventsFeed.as_view(),
+         name='calendar_events'),
+    path('calendar/<str:token>/registrations.ics',
+         ical.RegistrationsFeed.as_view(), name='calendar_registrations'),
     path('contactus/', views.ContactView.as_view(), name='contactus'),
     path('create/', views.EventCreateView.as_view(), name='event_create'),
-    path('event/<slug:slug>/', views.EventDetails.as_view(),
+    path('event/<slug:slug>/', page_views.EventDetails.as_view(),
          name='event_details'),
+    path('event/<slug:slug>/export/', views.RegistrationExportView.as_view(),
+         name='registration_export'),
     path('login/', views.CustomLoginView.as_view(), name='login'),
-    path('past-events/', views.PastEventList.as_view(), name='past_events'),
+    path('past-events/', page_views.PastEventList.as_view(),
+         name='past_events'),
+    path('search/', views.EventSearchView.as_view(), name='event_search'),
     path('success/', views.SuccessView.as_view(), name='success'),
 ]
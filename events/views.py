@@ -1,59 +1,188 @@
-from django.shortcuts import render
+import csv
+import json
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
 from django.views import generic, View
 from django.views.generic import TemplateView, DetailView
 from django.views.generic.edit import CreateView, FormMixin
 from django.shortcuts import redirect
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.contrib.auth.views import LoginView
 from datetime import date
 from .forms import EventCreateForm, EventRegistrationForm, ContactForm
-from .forms import CustomLoginForm
+from .forms import CustomLoginForm, EventFilterForm
 from .models import Event, EventRegistration, ContactMessage
+from .models import ArchivedEvent, StagedImage
+from .cache import AnonymousPageCacheMixin, attach_card_versions
+from .cache import ConditionalGetMixin, ListingsConditionalGetMixin
+from .cache import USER_VERSION_PREFIX, get_versions, make_etag, viewer_stamp
+from .ical import feed_token
+from .images import PLACEHOLDER_ID
+from .jobs import enqueue
+from .loaders import EventDetailsLoader
+from .pagination import CursorPaginationMixin, TieredCursorPaginator
+from .replicas import ListingsReplicaReadMixin, ReplicaReadMixin
+from .search import search_events
+from .services import register, cancel, update_note
+from .services import AlreadyRegistered, RegistrationError
+from .tasks import sends_mail
+from .uploads import SizeLimitedUploadHandler
+
+
+class EventCardsMixin:
+    """
+    Adds the version stamps used to cache each listed event's card.
+    """
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        attach_card_versions(context['object_list'])
+        return context
+
+
+class EventFilterMixin:
+    """
+    Reads the listing filters from the query string and provides the
+    query string that carries them over to other pages.
+    """
+    def get_filter_form(self):
+        if not hasattr(self, 'filter_form'):
+            params = self.request.GET.copy()
+            params.pop(self.cursor_query_param, None)
+            self.filter_form = EventFilterForm(params or None)
+        return self.filter_form
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = self.get_filter_form()
+        context['filter_form'] = form
+        context['filter_query'] = form.data.urlencode() if form.data else ''
+        return context
 
 
-class UpcomingEventList(generic.ListView):
+class UpcomingEventList(ListingsReplicaReadMixin, ListingsConditionalGetMixin,
+                        AnonymousPageCacheMixin, EventCardsMixin,
+                        EventFilterMixin, CursorPaginationMixin,
+                        generic.ListView):
     """
-    Displays a paginated list of upcoming published events,
+    Displays a cursor-paginated list of upcoming published events,
     ordered by date and time.
     """
     model = Event
     template_name = 'events/index.html'
     context_object_name = 'events'
     paginate_by = 6
+    cursor_ordering = ('date', 'time', 'id')
 
     def get_queryset(self):
         """
-        Returns a queryset of upcoming published events,
-        ordered by date and time.
+        Returns a queryset of upcoming published events matching the
+        listing filters, ordered by date and time.
         """
-        return (
+        return self.get_filter_form().filter(
             Event.objects
+            .select_related('created_by')
             .filter(status=1, date__gte=date.today())
-            .order_by('date', 'time')
+            .order_by('date', 'time', 'id')
         )
 
+    def get_context_data(self, **kwargs):
+        """
+        Adds the token of the user's registrations calendar feed.
+        """
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['feed_token'] = feed_token(self.request.user)
+        return context
+
 
-class PastEventList(generic.ListView):
+class PastEventList(ListingsReplicaReadMixin, ListingsConditionalGetMixin,
+                    AnonymousPageCacheMixin, EventCardsMixin, EventFilterMixin,
+                    CursorPaginationMixin, generic.ListView):
     """
-    Displays a paginated list of past published events,
-    ordered by most recent first.
+    Displays a cursor-paginated list of past published events,
+    ordered by most recent first. Events moved to the archive by the
+    archive_events command are listed along with the live ones.
     """
     model = Event
     template_name = 'events/past_events.html'
     context_object_name = 'past_events'
     paginate_by = 6
+    cursor_ordering = ('-date', '-time', '-id')
 
     def get_queryset(self):
         """
-        Returns a queryset of past published events,
-        ordered by most recent date and time.
+        Returns a queryset of past published events matching the
+        listing filters, ordered by most recent date and time.
         """
-        return (
+        return self.get_filter_form().filter(
             Event.objects
+            .select_related('created_by')
             .filter(status=1, date__lt=date.today())
-            .order_by('-date', '-time')
+            .order_by('-date', '-time', '-id')
+        )
+
+    def get_archive_queryset(self):
+        """
+        Returns the archived events matching the listing filters.
+        """
+        return self.get_filter_form().filter(
+            ArchivedEvent.objects
+            .select_related('created_by')
+            .filter(status=1)
+        )
+
+    def get_cursor_paginator(self, queryset, page_size):
+        return TieredCursorPaginator(
+            [queryset, self.get_archive_queryset()], page_size,
+            self.cursor_ordering,
         )
 
 
+class EventSearchView(TemplateView):
+    """
+    Searches published events by title, description and location
+    using the full-text index, best matches first.
+    Results are paged without counting them, and only the first
+    max_pages pages are served, since ranking gets less useful
+    the deeper a visitor goes.
+    """
+    template_name = 'events/search.html'
+    page_size = 6
+    max_pages = 20
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        try:
+            page_number = int(self.request.GET.get('page', 1))
+        except ValueError:
+            raise Http404("Invalid page.")
+        if not 1 <= page_number <= self.max_pages:
+            raise Http404("Invalid page.")
+
+        events = search_events(
+            query, self.page_size + 1, (page_number - 1) * self.page_size
+        )
+        has_next = (
+            len(events) > self.page_size and page_number < self.max_pages
+        )
+        events = events[:self.page_size]
+        attach_card_versions(events)
+        context.update({
+            'query': query,
+            'events': events,
+            'page_number': page_number,
+            'has_next': has_next,
+            'has_previous': page_number > 1,
+        })
+        return context
+
+
 class EventCreateView(CreateView):
     """
     Handles the creation of a new event,
@@ -64,12 +193,37 @@ class EventCreateView(CreateView):
     template_name = 'events/event_create.html'
     success_url = '/success?f=e'
 
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Writes uploads with SizeLimitedUploadHandler, so an oversized
+        image is cut off instead of filling the disk. The CSRF check
+        reads the upload, so it runs after the handler is in place.
+        """
+        request.upload_handlers = [SizeLimitedUploadHandler(request)]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
     def form_valid(self, form):
         """
         Sets the current user as the event creator before saving the form.
+        An uploaded image is staged in the database with the event and
+        processed by a background job; until then the event shows the
+        placeholder.
         """
         form.instance.created_by = self.request.user
-        return super().form_valid(form)
+        upload = form.cleaned_data.get('featured_image')
+        if not isinstance(upload, UploadedFile):
+            return super().form_valid(form)
+        form.instance.featured_image = PLACEHOLDER_ID
+        upload.seek(0)
+        with transaction.atomic():
+            response = super().form_valid(form)
+            staged = StagedImage.objects.create(data=upload.read())
+            enqueue(
+                'process_event_image',
+                event_id=self.object.pk, image_id=staged.pk,
+            )
+        return response
 
 
 class SuccessView(TemplateView):
@@ -88,7 +242,8 @@ class SuccessView(TemplateView):
         return context
 
 
-class EventDetails(FormMixin, DetailView):
+class EventDetails(ReplicaReadMixin, ConditionalGetMixin, FormMixin,
+                   DetailView):
     """
     Displays event details and manages event registrations.
     Handles displaying the registration form, viewing existing registrations,
@@ -96,41 +251,77 @@ class EventDetails(FormMixin, DetailView):
     by authenticated users.
     """
     model = Event
+    queryset = Event.objects.select_related('created_by')
     template_name = "events/event_details.html"
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
     form_class = EventRegistrationForm
 
+    def setup(self, request, *args, **kwargs):
+        """
+        Creates the loader that GET and POST share for this request.
+        """
+        super().setup(request, *args, **kwargs)
+        self.loader = EventDetailsLoader(
+            self.get_queryset(), kwargs.get(self.slug_url_kwarg), request.user
+        )
+
+    def use_replica(self, request):
+        """
+        Reads from the replica for anonymous visitors only, since
+        logged-in users see their own registration on the page.
+        """
+        return (
+            super().use_replica(request) and
+            not request.user.is_authenticated
+        )
+
+    def get_object(self, queryset=None):
+        return self.loader.event
+
+    def get_etag(self, request, *args, **kwargs):
+        """
+        Derives the ETag from the event row the page needs anyway, so a
+        matching request skips the roster query and rendering.
+        """
+        event = self.loader.event
+        creator_version = get_versions(
+            USER_VERSION_PREFIX, [event.created_by_id]
+        )[event.created_by_id]
+        return make_etag(
+            event.pk, event.updated_at.isoformat(), event.roster_version,
+            creator_version, viewer_stamp(request),
+        )
+
+    def get_last_modified(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return None
+        return self.loader.event.updated_at
+
     def get_success_url(self):
         return self.request.path
 
+    def get_form_kwargs(self):
+        """
+        Pre-fills the form with the user's existing registration, if any.
+        """
+        kwargs = super().get_form_kwargs()
+        kwargs['instance'] = self.loader.user_registration
+        return kwargs
+
     def get_context_data(self, **kwargs):
         """
         Adds event registration form and registration status to the context.
         If the user is authenticated and already registered, pre-fills the form
         and sets a flag. Also includes all registrations for the event.
         """
+        # Load the roster first so the user's registration is found in it.
+        registrations = self.loader.registrations
         context = super().get_context_data(**kwargs)
-        event = self.get_object()
-        user = self.request.user
-
-        if user.is_authenticated:
-            try:
-                registration = EventRegistration.objects.get(
-                    event=event, user=user
-                )
-                form = EventRegistrationForm(instance=registration)
-                context['already_registered'] = True
-            except EventRegistration.DoesNotExist:
-                form = EventRegistrationForm()
-                context['already_registered'] = False
-        else:
-            form = EventRegistrationForm()
-
-        context['form'] = form
-        context['registrations'] = EventRegistration.objects.filter(
-            event=event
+        context['already_registered'] = (
+            self.loader.user_registration is not None
         )
+        context['registrations'] = registrations
         return context
 
     def post(self, request, *args, **kwargs):
@@ -149,47 +340,99 @@ class EventDetails(FormMixin, DetailView):
 
         # Handle cancellation
         if request.POST.get("cancel_registration"):
-            EventRegistration.objects.filter(
-                event=event, user=request.user
-            ).delete()
+            cancel(event, request.user)
             return redirect("event_details", slug=event.slug)
 
         # Handle update
         if request.POST.get("update_registration"):
-            registration = EventRegistration.objects.get(
-                event=event, user=request.user
-            )
-            new_note = request.POST.get("note")
-
-            # Only update if the note has changed
-            if new_note != registration.note:
-                registration.note = new_note
-                registration.save()
+            registration = self.loader.user_registration
+            if registration:
+                update_note(registration, request.POST.get("note"))
             return redirect("event_details", slug=event.slug)
 
         # Handle new registration
         form = EventRegistrationForm(request.POST)
         if form.is_valid():
-            registration = form.save(commit=False)
-            registration.event = event
-            registration.user = request.user
-            registration.save()
+            try:
+                register(event, request.user, form.cleaned_data['note'])
+            except AlreadyRegistered:
+                # A double submit; the first request already registered.
+                pass
+            except RegistrationError as error:
+                form.add_error(None, str(error))
+                return self.render_to_response(
+                    self.get_context_data(form=form)
+                )
             return redirect("event_details", slug=event.slug)
 
-        registrations = EventRegistration.objects.filter(event=event)
-        is_registered = EventRegistration.objects.filter(
-            event=event, user=request.user
-        ).exists()
-        return render(
-            request,
-            "events/event_details.html",
-            {
-                "event": event,
-                "form": form,
-                "registrations": registrations,
-                "is_registered": is_registered,
-            },
+        return self.render_to_response(self.get_context_data(form=form))
+
+
+class Echo:
+    """
+    A file-like object that returns what is written to it,
+    so csv.writer can produce rows for a streaming response.
+    """
+    def write(self, value):
+        return value
+
+
+class RegistrationExportView(View):
+    """
+    Streams an event's registrations as CSV or JSONL to its creator
+    or to staff. Rows are read from the database in chunks and written
+    out as they arrive, so memory use does not grow with the roster.
+    """
+    chunk_size = 2000
+    fields = (
+        'user__username', 'user__first_name', 'user__last_name',
+        'user__email', 'note', 'registered_at',
+    )
+    headers = (
+        'username', 'first_name', 'last_name',
+        'email', 'note', 'registered_at',
+    )
+
+    def get(self, request, slug):
+        event = get_object_or_404(
+            Event.objects.only('id', 'slug', 'created_by_id'), slug=slug
+        )
+        user = request.user
+        if not (user.is_staff or event.created_by_id == user.pk):
+            raise PermissionDenied
+
+        rows = (
+            EventRegistration.objects
+            .filter(event=event)
+            .order_by('registered_at', 'id')
+            .values_list(*self.fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        if request.GET.get('format') == 'jsonl':
+            content, content_type, extension = (
+                self.jsonl_lines(rows), 'application/jsonl', 'jsonl'
+            )
+        else:
+            content, content_type, extension = (
+                self.csv_lines(rows), 'text/csv', 'csv'
+            )
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{event.slug}-registrations.{extension}"'
         )
+        return response
+
+    def csv_lines(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.headers)
+        for row in rows:
+            yield writer.writerow(row)
+
+    def jsonl_lines(self, rows):
+        for row in rows:
+            record = dict(zip(self.headers, row))
+            record['registered_at'] = record['registered_at'].isoformat()
+            yield json.dumps(record) + '\n'
 
 
 class ContactView(View):
@@ -204,21 +447,26 @@ class ContactView(View):
     def post(self, request):
         """
         Processes the submitted contact form.
-        Saves the message if valid and redirects to the success page;
-        otherwise, re-renders the form with validation errors.
+        Saves the message if valid, queues the notification to the site
+        managers if there are any and mail is configured, and redirects
+        to the success page; otherwise, re-renders the form with
+        validation errors.
         """
         form = ContactForm(request.POST)
         if form.is_valid():
-            ContactMessage.objects.create(
-                name=form.cleaned_data['name'],
-                email=form.cleaned_data['email'],
-                message=form.cleaned_data['message']
-            )
+            with transaction.atomic():
+                message = ContactMessage.objects.create(
+                    name=form.cleaned_data['name'],
+                    email=form.cleaned_data['email'],
+                    message=form.cleaned_data['message']
+                )
+                if settings.MANAGERS and sends_mail():
+                    enqueue('notify_contact_message', message_id=message.pk)
             return redirect('/success?f=c')
         return render(request, 'events/contact.html', {'form': form})
 
 
-class AboutView(TemplateView):
+class AboutView(AnonymousPageCacheMixin, TemplateView):
     """
     Renders the static About page of the events site.
     """
@@ -230,4 +478,4 @@ class CustomLoginView(LoginView):
     Handles user login using a custom authentication form and template.
     """
     authentication_form = CustomLoginForm
-    template_name = 'templates/account/login.html'
+    template_name = 'account/login.html'